@@ -0,0 +1,72 @@
+# billing_catalog.py
+# The restaurant menu compiled into arrays for day11python_billing.py.
+#
+# A MENU dict ({category: [{"item", "price"}, ...]}) becomes parallel arrays of
+# item name, category id and price, built once per process. An order is then
+# an int quantity vector over the items, and totals, tax, category splits and
+# top dishes are a handful of NumPy reductions over it.
+from typing import TYPE_CHECKING, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+BILL_COLUMNS = ["Category", "Item", "Unit Price", "Quantity", "Line Total"]
+
+
+class MenuCatalog:
+    def __init__(self, menu: Mapping[str, Sequence[Mapping]]):
+        self.categories: Tuple[str, ...] = tuple(menu)
+        rows = [(c, r["item"], float(r["price"])) for c, cat in enumerate(self.categories) for r in menu[cat]]
+        self.items: Tuple[str, ...] = tuple(name for _, name, _ in rows)
+        self.category_id = np.array([c for c, _, _ in rows], dtype=np.int16)
+        self.price = np.array([p for _, _, p in rows], dtype=np.float64)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.items)}
+        # item ids per category, in menu order (for laying out the order form)
+        self.by_category: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(np.flatnonzero(self.category_id == c)) for c in range(len(self.categories)))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def empty_order(self) -> np.ndarray:
+        return np.zeros(len(self.items), dtype=np.int32)
+
+    def line_totals(self, qty: np.ndarray) -> np.ndarray:
+        return self.price * qty
+
+    def totals(self, qty: np.ndarray, tax_percent: float) -> Tuple[float, float, float]:
+        """(subtotal, tax, total) for the order."""
+        subtotal = float(self.price @ qty)
+        tax = subtotal * (tax_percent / 100.0)
+        return subtotal, tax, subtotal + tax
+
+    def category_totals(self, qty: np.ndarray) -> np.ndarray:
+        """Revenue per category id."""
+        return np.bincount(self.category_id, weights=self.line_totals(qty), minlength=len(self.categories))
+
+    def category_split(self, qty: np.ndarray) -> List[Tuple[str, float]]:
+        """(category, revenue) for categories in the order, largest first."""
+        rev = self.category_totals(qty)
+        return [(self.categories[c], float(rev[c])) for c in np.argsort(-rev, kind="stable") if rev[c] > 0]
+
+    def top_items(self, qty: np.ndarray, k: int = 8) -> List[Tuple[str, float]]:
+        """(item, revenue) of the k best-earning ordered dishes, largest first."""
+        line = self.line_totals(qty)
+        ordered = np.flatnonzero(qty)
+        top = ordered[np.argsort(-line[ordered], kind="stable")[:k]]
+        return [(self.items[i], float(line[i])) for i in top]
+
+    def bill_frame(self, qty: np.ndarray) -> "pd.DataFrame":
+        """The bill table (BILL_COLUMNS), one row per ordered item in menu order."""
+        import pandas as pd   # only needed once there is a bill
+
+        ids = np.flatnonzero(qty)
+        return pd.DataFrame({
+            "Category": [self.categories[c] for c in self.category_id[ids]],
+            "Item": [self.items[i] for i in ids],
+            "Unit Price": self.price[ids],
+            "Quantity": qty[ids].astype(int),
+            "Line Total": self.price[ids] * qty[ids],
+        }, columns=BILL_COLUMNS)
@@ -0,0 +1,107 @@
+# billing_export.py
+# End-of-day / month export: every ledger invoice in a date range rendered as
+# PDF (same layout as the app's download) and written into one ZIP.
+#
+# PDFs are built on a process pool; each worker opens its own read connection
+# to the ledger, so only invoice numbers go out and PDF bytes come back. At
+# most a few chunks are in flight at a time and each PDF is written to the ZIP
+# as soon as its chunk returns, so memory stays flat however long the range.
+# Run: python billing_export.py --from 2025-01-01 --to 2025-01-31 --out jan.zip
+import argparse
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import BinaryIO, Callable, List, Optional, Tuple, Union
+
+import billing_invoice as invoice
+import billing_ledger
+
+CHUNK = 16   # invoices per worker task
+
+# progress(done, total, seconds elapsed)
+Progress = Callable[[int, int, float], None]
+
+_ledger: Optional[billing_ledger.Ledger] = None
+
+
+def _open_ledger(path: str):
+    global _ledger
+    _ledger = billing_ledger.Ledger(path)
+
+
+def _render_chunk(invoice_nos: List[str]) -> List[Tuple[str, bytes]]:
+    """Worker: (file name, PDF bytes) for each invoice number."""
+    import pandas as pd
+
+    out = []
+    for no in invoice_nos:
+        lines, meta = _ledger.load_invoice(no)
+        df = pd.DataFrame(lines, columns=billing_ledger.LINE_COLUMNS)
+        out.append((f"{no}.pdf", invoice.make_pdf_bytes(df, meta)))
+    return out
+
+
+def export_pdfs(out: Union[str, BinaryIO], start, end, db_path: str = billing_ledger.DEFAULT_PATH,
+                workers: Optional[int] = None, progress: Optional[Progress] = None) -> dict:
+    """Write a ZIP of PDFs for every invoice dated start..end to `out` (a path or binary file)."""
+    if not invoice.PDF_AVAILABLE:
+        raise RuntimeError("PDF export needs reportlab: pip install reportlab")
+    ledger = billing_ledger.Ledger(db_path)
+    try:
+        numbers = ledger.invoice_numbers(start, end)
+    finally:
+        ledger.close()
+    total = len(numbers)
+    chunks = [numbers[i:i + CHUNK] for i in range(0, total, CHUNK)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(chunks) or 1))
+
+    done = nbytes = 0
+    t0 = time.perf_counter()
+    # spawn: forking a threaded server process (Streamlit) is unsafe
+    ctx = multiprocessing.get_context("spawn")
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf, \
+            ProcessPoolExecutor(workers, mp_context=ctx, initializer=_open_ledger, initargs=(db_path,)) as pool:
+        pending, todo = deque(), iter(chunks)
+        for chunk in todo:
+            pending.append(pool.submit(_render_chunk, chunk))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            for name, pdf in pending.popleft().result():
+                zf.writestr(name, pdf)
+                nbytes += len(pdf)
+                done += 1
+            next_chunk = next(todo, None)
+            if next_chunk is not None:
+                pending.append(pool.submit(_render_chunk, next_chunk))
+            if progress:
+                progress(done, total, time.perf_counter() - t0)
+    seconds = time.perf_counter() - t0
+    return {"invoices": total, "pdf_bytes": nbytes, "seconds": seconds, "workers": workers,
+            "per_second": total / seconds if seconds else 0.0}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Export ledger invoices in a date range as PDFs in one ZIP.")
+    ap.add_argument("--from", dest="start", type=date.fromisoformat, required=True, help="first day, YYYY-MM-DD")
+    ap.add_argument("--to", dest="end", type=date.fromisoformat, required=True, help="last day, YYYY-MM-DD")
+    ap.add_argument("--out", default="invoices.zip")
+    ap.add_argument("--db", default=billing_ledger.DEFAULT_PATH)
+    ap.add_argument("--workers", type=int, default=0, help="processes (default: all cores)")
+    args = ap.parse_args()
+
+    def report(done, total, seconds):
+        print(f"\r{done:,}/{total:,} invoices  {done / seconds if seconds else 0:,.0f}/s", end="", flush=True)
+
+    r = export_pdfs(args.out, args.start, args.end, args.db, args.workers or None, report)
+    print()
+    print(f"{r['invoices']:,} PDFs ({r['pdf_bytes'] / 1e6:.1f} MB) on {r['workers']} workers "
+          f"in {r['seconds']:.2f}s → {r['per_second']:,.0f} invoices/s, written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
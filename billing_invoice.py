@@ -0,0 +1,147 @@
+# billing_invoice.py
+# Invoice artifacts (CSV / PDF) for day11python_billing.py, plus a byte-bounded
+# LRU cache so each invoice's files are built once, not on every rerun.
+import hashlib
+import importlib.util
+import io
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+# Optional PDF: probe for reportlab without importing it; it loads on the first PDF
+PDF_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+
+
+def make_csv_bytes(df, meta):
+    buf = io.StringIO()
+    buf.write(f"{meta['biz_name']}\n{meta['biz_addr']}\nPhone: {meta['biz_phone']}\n")
+    buf.write(f"Invoice: {meta['invoice_no']}, Date: {meta['date_str']}\n")
+    if meta["customer_name"]: buf.write(f"Customer: {meta['customer_name']}\n")
+    if meta["customer_phone"]: buf.write(f"Customer Phone: {meta['customer_phone']}\n")
+    buf.write("\n")
+    df.to_csv(buf, index=False)
+    buf.write("\n")
+    buf.write(f"Subtotal,{meta['currency']}{meta['subtotal']:.2f}\n")
+    buf.write(f"Tax ({meta['tax_rate']}%),{meta['currency']}{meta['tax']:.2f}\n")
+    buf.write(f"Total,{meta['currency']}{meta['total']:.2f}\n")
+    return buf.getvalue().encode("utf-8")
+
+
+def make_pdf_bytes(df, meta):
+    if not PDF_AVAILABLE:
+        return None
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=24, bottomMargin=24, leftMargin=24, rightMargin=24)
+    styles = getSampleStyleSheet()
+    story = []
+
+    story.append(Paragraph(meta['biz_name'], styles["Title"]))
+    story.append(Paragraph(meta["biz_addr"], styles["Normal"]))
+    story.append(Paragraph(f"Phone: {meta['biz_phone']}", styles["Normal"]))
+    story.append(Spacer(1, 8))
+
+    story.append(Paragraph(f"<b>Invoice:</b> {meta['invoice_no']} &nbsp;&nbsp; <b>Date:</b> {meta['date_str']}", styles["Normal"]))
+    if meta["customer_name"] or meta["customer_phone"]:
+        s = "<b>Bill To:</b> " + (meta["customer_name"] or "")
+        if meta["customer_phone"]:
+            s += f" &nbsp;&nbsp; <b>Phone:</b> {meta['customer_phone']}"
+        story.append(Paragraph(s, styles["Normal"]))
+    story.append(Spacer(1, 12))
+
+    table_data = [["Item", "Unit Price", "Qty", "Line Total"]]
+    for _, r in df.iterrows():
+        table_data.append([
+            r["Item"],
+            f"{meta['currency']}{float(r['Unit Price']):.2f}",
+            str(int(r["Quantity"])),
+            f"{meta['currency']}{float(r['Line Total']):.2f}",
+        ])
+    tbl = Table(table_data, colWidths=[230, 90, 60, 100])
+    tbl.setStyle(TableStyle([
+        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#eeeeee")),
+        ("GRID", (0,0), (-1,-1), 0.25, colors.gray),
+        ("ALIGN", (1,1), (-1,-1), "RIGHT"),
+        ("FONTNAME", (0,0), (-1,0), "Helvetica-Bold"),
+        ("BOTTOMPADDING", (0,0), (-1,0), 6),
+    ]))
+    story.append(tbl)
+    story.append(Spacer(1, 12))
+
+    totals = [
+        ["Subtotal", f"{meta['currency']}{meta['subtotal']:.2f}"],
+        [f"Tax ({meta['tax_rate']}%)", f"{meta['currency']}{meta['tax']:.2f}"],
+        ["Total", f"{meta['currency']}{meta['total']:.2f}"],
+    ]
+    t2 = Table(totals, colWidths=[230+90+60, 100])
+    t2.setStyle(TableStyle([
+        ("ALIGN", (1,0), (1,-1), "RIGHT"),
+        ("GRID", (0,0), (-1,-1), 0.25, colors.gray),
+        ("BACKGROUND", (0,-1), (-1,-1), colors.HexColor("#f5f5f5")),
+        ("FONTNAME", (0,-1), (-1,-1), "Helvetica-Bold"),
+    ]))
+    story.append(t2)
+    story.append(Spacer(1, 10))
+    story.append(Paragraph("Nandri! Thanks for dining with us. 🍽️", styles["Italic"]))
+    doc.build(story)
+    buffer.seek(0)
+    return buffer.read()
+
+
+# -------------------- Artifact cache --------------------
+def content_hash(df, meta) -> str:
+    """Digest of everything that ends up in the invoice files."""
+    h = hashlib.sha1(json.dumps(meta, sort_keys=True, default=str).encode("utf-8"))
+    h.update(df.to_csv(index=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ArtifactCache:
+    """LRU of built invoice files, bounded by total bytes.
+
+    Keys are (invoice_no, content hash, kind). One instance is shared by all
+    sessions of the app process, so it is guarded by a lock; builders run
+    outside the lock and a duplicate build just overwrites the same entry.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key: Hashable, data: bytes):
+        if len(data) > self.max_bytes:
+            return   # would evict everything else; serve it uncached
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._items[key] = data
+            self.nbytes += len(data)
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        data = self.get(key)
+        if data is None:
+            data = build()
+            if data is not None:
+                self.put(key, data)
+        return data
@@ -0,0 +1,170 @@
+# billing_ledger.py
+# Durable sales ledger for day11python_billing.py (SQLite, WAL mode).
+#
+# Every generated bill is written as one invoice row plus its line items, and
+# the daily / monthly rollup rows are bumped in the same transaction. Period
+# reports read the rollups (one row per day), so "today", "this month" or any
+# date range never scan line items; per-dish reports read the per-day item
+# rollup, and the line-item indexes serve ad-hoc queries.
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_PATH = os.environ.get("BILLING_LEDGER_DB", "billing_ledger.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoices (
+    invoice_no     TEXT PRIMARY KEY,
+    ts             TEXT NOT NULL,      -- ISO timestamp
+    day            TEXT NOT NULL,      -- YYYY-MM-DD
+    customer_name  TEXT,
+    customer_phone TEXT,
+    subtotal       REAL NOT NULL,
+    tax            REAL NOT NULL,
+    total          REAL NOT NULL,
+    meta           TEXT NOT NULL       -- full invoice meta as JSON, for reprints
+);
+CREATE INDEX IF NOT EXISTS invoices_day ON invoices(day);
+
+CREATE TABLE IF NOT EXISTS invoice_lines (
+    invoice_no  TEXT NOT NULL REFERENCES invoices(invoice_no),
+    line_no     INTEGER NOT NULL,
+    day         TEXT NOT NULL,
+    category    TEXT NOT NULL,
+    item        TEXT NOT NULL,
+    unit_price  REAL NOT NULL,
+    quantity    INTEGER NOT NULL,
+    line_total  REAL NOT NULL,
+    PRIMARY KEY (invoice_no, line_no)
+);
+CREATE INDEX IF NOT EXISTS lines_day ON invoice_lines(day);
+CREATE INDEX IF NOT EXISTS lines_category ON invoice_lines(category, day);
+CREATE INDEX IF NOT EXISTS lines_item ON invoice_lines(item, day);
+
+CREATE TABLE IF NOT EXISTS daily_sales (
+    day       TEXT PRIMARY KEY,
+    invoices  INTEGER NOT NULL,
+    subtotal  REAL NOT NULL,
+    tax       REAL NOT NULL,
+    total     REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_items (
+    day       TEXT NOT NULL,
+    item      TEXT NOT NULL,
+    category  TEXT NOT NULL,
+    quantity  INTEGER NOT NULL,
+    revenue   REAL NOT NULL,
+    PRIMARY KEY (day, item)
+);
+CREATE TABLE IF NOT EXISTS monthly_sales (
+    month     TEXT PRIMARY KEY,        -- YYYY-MM
+    invoices  INTEGER NOT NULL,
+    subtotal  REAL NOT NULL,
+    tax       REAL NOT NULL,
+    total     REAL NOT NULL
+);
+"""
+
+_ROLLUP = """
+INSERT INTO {table} ({key}, invoices, subtotal, tax, total) VALUES (?, 1, ?, ?, ?)
+ON CONFLICT({key}) DO UPDATE SET
+    invoices = invoices + 1,
+    subtotal = subtotal + excluded.subtotal,
+    tax      = tax + excluded.tax,
+    total    = total + excluded.total
+"""
+
+_ITEM_ROLLUP = """
+INSERT INTO daily_items (day, item, category, quantity, revenue) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(day, item) DO UPDATE SET
+    quantity = quantity + excluded.quantity,
+    revenue  = revenue + excluded.revenue
+"""
+
+LINE_COLUMNS = ("Category", "Item", "Unit Price", "Quantity", "Line Total")
+
+
+def _day(d) -> str:
+    return d.isoformat() if isinstance(d, (date, datetime)) else str(d)
+
+
+class Ledger:
+    """One SQLite connection shared by the app's sessions; every call holds a lock."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def _query(self, sql: str, args: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self.conn.execute(sql, args).fetchall()
+
+    # -------------------- Writes --------------------
+    def record_invoice(self, lines: Iterable[Dict], meta: Dict, when: datetime):
+        """Store one bill: header, line items (dicts keyed like LINE_COLUMNS) and rollups, atomically."""
+        day, month = when.date().isoformat(), when.strftime("%Y-%m")
+        money = (round(meta["subtotal"], 2), round(meta["tax"], 2), round(meta["total"], 2))
+        rows = [
+            (meta["invoice_no"], n, day, r["Category"], r["Item"],
+             float(r["Unit Price"]), int(r["Quantity"]), float(r["Line Total"]))
+            for n, r in enumerate(lines, 1)
+        ]
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO invoices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (meta["invoice_no"], when.isoformat(timespec="seconds"), day,
+                 meta.get("customer_name", ""), meta.get("customer_phone", ""),
+                 *money, json.dumps(meta, default=str)))
+            self.conn.executemany("INSERT INTO invoice_lines VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute(_ROLLUP.format(table="daily_sales", key="day"), (day, *money))
+            self.conn.execute(_ROLLUP.format(table="monthly_sales", key="month"), (month, *money))
+            self.conn.executemany(_ITEM_ROLLUP, [(day, r[4], r[3], r[6], r[7]) for r in rows])
+
+    # -------------------- Reports --------------------
+    def sales_between(self, start, end) -> Dict:
+        """Totals for the days start..end inclusive, summed from the daily rollup."""
+        row = self._query(
+            "SELECT COUNT(*), COALESCE(SUM(invoices), 0), COALESCE(SUM(subtotal), 0),"
+            " COALESCE(SUM(tax), 0), COALESCE(SUM(total), 0)"
+            " FROM daily_sales WHERE day BETWEEN ? AND ?", (_day(start), _day(end)))[0]
+        return dict(zip(("days", "invoices", "subtotal", "tax", "total"), row))
+
+    def day_sales(self, d) -> Dict:
+        return self.sales_between(d, d)
+
+    def month_sales(self, month: str) -> Dict:
+        """Totals for a YYYY-MM month, straight from the monthly rollup."""
+        rows = self._query("SELECT invoices, subtotal, tax, total FROM monthly_sales WHERE month = ?", (month,))
+        return dict(zip(("invoices", "subtotal", "tax", "total"), rows[0] if rows else (0, 0.0, 0.0, 0.0)))
+
+    def top_items(self, start, end, limit: int = 8) -> List[Tuple[str, int, float]]:
+        """(item, quantity, revenue) for the best-selling dishes in the range."""
+        return self._query(
+            "SELECT item, SUM(quantity), SUM(revenue) FROM daily_items"
+            " WHERE day BETWEEN ? AND ? GROUP BY item ORDER BY 3 DESC LIMIT ?",
+            (_day(start), _day(end), limit))
+
+    def invoice_numbers(self, start, end) -> List[str]:
+        return [r[0] for r in self._query(
+            "SELECT invoice_no FROM invoices WHERE day BETWEEN ? AND ? ORDER BY ts, invoice_no",
+            (_day(start), _day(end)))]
+
+    def load_invoice(self, invoice_no: str) -> Optional[Tuple[List[Dict], Dict]]:
+        """(line item dicts, meta) for a stored bill, or None."""
+        rows = self._query("SELECT meta FROM invoices WHERE invoice_no = ?", (invoice_no,))
+        if not rows:
+            return None
+        lines = [dict(zip(LINE_COLUMNS, r)) for r in self._query(
+            "SELECT category, item, unit_price, quantity, line_total FROM invoice_lines"
+            " WHERE invoice_no = ? ORDER BY line_no", (invoice_no,))]
+        return lines, json.loads(rows[0][0])
@@ -0,0 +1,63 @@
+# billing_sequence.py
+# Invoice numbers for day11python_billing.py from a counter row in SQLite.
+#
+# Every terminal (session, thread or process) draws from the same row. The
+# increment runs in a BEGIN IMMEDIATE transaction, which takes SQLite's write
+# lock, so two draws can never see the same value.
+#
+# With block=1 (the default) each invoice costs one small write and the numbers
+# are gap-free and strictly increasing across all terminals. A larger block
+# reserves that many numbers per write for this process: allocation is then
+# mostly an in-memory increment, but numbers from different processes interleave
+# and the unused rest of a block is skipped when the process exits.
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional
+
+import billing_ledger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sequences (
+    name   TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL      -- last number handed out (or reserved)
+);
+"""
+
+
+class InvoiceSequence:
+    def __init__(self, path: str = billing_ledger.DEFAULT_PATH, name: str = "invoice", block: int = 1):
+        if block < 1:
+            raise ValueError("block must be at least 1")
+        self.name, self.block = name, block
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO sequences VALUES (?, 0)", (name,))
+        self._lock = threading.Lock()
+        self._next = self._end = 0   # numbers _next.._end-1 are reserved for this process
+
+    def _reserve(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("UPDATE sequences SET value = value + ? WHERE name = ?", (self.block, self.name))
+            end = self.conn.execute("SELECT value FROM sequences WHERE name = ?", (self.name,)).fetchone()[0]
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self._next, self._end = end - self.block + 1, end + 1
+
+    def next(self) -> int:
+        """The next number (starting at 1)."""
+        with self._lock:
+            if self._next >= self._end:
+                self._reserve()
+            n = self._next
+            self._next += 1
+            return n
+
+    def invoice_number(self, when: Optional[datetime] = None) -> str:
+        """e.g. INV-20250101-00000042; the counter carries on across days."""
+        when = when or datetime.now()
+        return f"INV-{when:%Y%m%d}-{self.next():08d}"
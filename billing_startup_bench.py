@@ -0,0 +1,123 @@
+# billing_startup_bench.py
+# Cold-start cost of day11python_billing.py: every measurement runs in a fresh
+# interpreter, so numbers include everything a module pulls in. Besides the
+# import times, the app's first script run is executed headless (AppTest)
+# against a ledger seeded with a sale today, which is what a new session sees.
+# Exits non-zero if that first run loads pandas, matplotlib or reportlab.
+# Run: python billing_startup_bench.py --repeat 5
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(HERE, "day11python_billing.py")
+MODULES = [
+    "streamlit", "numpy", "pandas", "matplotlib.pyplot", "reportlab.platypus",
+    "billing_catalog", "billing_invoice", "billing_ledger", "billing_sequence", "billing_export",
+]
+HEAVY = ("pandas", "matplotlib", "reportlab")
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+{imports}
+dt = time.perf_counter() - t
+print(json.dumps({{"seconds": dt, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# Seeds the ledger named by BILLING_LEDGER_DB (once), then times one AppTest run.
+_FIRST_RUN = """
+import json, sys, time
+from datetime import datetime
+import billing_ledger
+ledger = billing_ledger.Ledger()
+if ledger.load_invoice("INV-BENCH-1") is None:
+    ledger.record_invoice(
+        [{{"Category": "Biryani", "Item": "Egg Biryani", "Unit Price": 220.0, "Quantity": 2, "Line Total": 440.0}}],
+        {{"invoice_no": "INV-BENCH-1", "subtotal": 440.0, "tax": 22.0, "total": 462.0}}, datetime.now())
+ledger.close()
+from streamlit.testing.v1 import AppTest
+t = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=120).run()
+dt = time.perf_counter() - t
+print(json.dumps({{"seconds": dt, "loaded": [m for m in {heavy!r} if m in sys.modules],
+                   "errors": [str(e.value) for e in at.exception]}}))
+"""
+
+
+def app_imports(path: str = APP) -> List[str]:
+    """Modules imported at the top level of the app, in order."""
+    tree = ast.parse(open(path, encoding="utf-8").read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def _best_run(code: str, repeat: int, env: Optional[Dict[str, str]] = None) -> dict:
+    """Run `code` in `repeat` new interpreters; keep the fastest result it printed."""
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env, capture_output=True, text=True)
+        if out.returncode:
+            return {"seconds": None, "loaded": [], "error": out.stderr.strip().splitlines()[-1]}
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        if best is None or r["seconds"] < best["seconds"]:
+            best = r
+    return best
+
+
+def cold_import(modules: List[str], repeat: int) -> dict:
+    """Best-of-`repeat` time to import `modules` in a new interpreter."""
+    return _best_run(_PROBE.format(imports="\n".join(f"import {m}" for m in modules), heavy=HEAVY), repeat)
+
+
+def first_run(repeat: int, app: str = APP) -> dict:
+    """Best-of-`repeat` time of the app's first script run, on a seeded throwaway ledger."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, BILLING_LEDGER_DB=os.path.join(tmp, "ledger.db"))
+        return _best_run(_FIRST_RUN.format(app=app, heavy=HEAVY), repeat, env)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure cold import time of the billing app's modules.")
+    ap.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module (best is kept)")
+    args = ap.parse_args()
+
+    print(f"{'module':<22} {'ms':>8}   heavy modules loaded")
+    for m in MODULES:
+        r = cold_import([m], args.repeat)
+        ms = f"{r['seconds'] * 1000:8.1f}" if r["seconds"] is not None else f"{'n/a':>8}"
+        print(f"{m:<22} {ms}   {', '.join(r['loaded']) or r.get('error', '-')}")
+
+    startup = app_imports()
+    r = cold_import(startup, args.repeat)
+    print()
+    print(f"app startup imports ({len(startup)}): {', '.join(startup)}")
+    if r["seconds"] is None:
+        print(f"failed: {r['error']}")
+    else:
+        print(f"total {r['seconds'] * 1000:.1f} ms; heavy modules loaded: {', '.join(r['loaded']) or 'none'}")
+
+    r = first_run(args.repeat)
+    print()
+    if r["seconds"] is None:
+        sys.exit(f"first script run failed: {r['error']}")
+    print(f"first script run (seeded ledger): {r['seconds'] * 1000:.1f} ms; "
+          f"heavy modules loaded: {', '.join(r['loaded']) or 'none'}")
+    if r["errors"]:
+        sys.exit(f"first script run raised: {'; '.join(r['errors'])}")
+    if r["loaded"]:
+        sys.exit(f"FAIL: a new session's first run imports {', '.join(r['loaded'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,19 @@
 # Run: streamlit run restaurant_billing_south_nonveg.py
 
 import io
-from datetime import datetime
-import pandas as pd
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime
 import streamlit as st
-import matplotlib.pyplot as plt
-
-# Optional PDF
-PDF_AVAILABLE = True
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-except Exception:
-    PDF_AVAILABLE = False
+
+import billing_catalog
+import billing_export
+import billing_invoice as invoice
+import billing_ledger
+import billing_sequence
+from billing_invoice import PDF_AVAILABLE
 
 st.set_page_config(page_title="South-Indian Non-Veg Billing", page_icon="🍗", layout="wide")
 
@@ -50,6 +49,9 @@ with st.sidebar:
     customer_name = st.text_input("Customer Name", value="")
     customer_phone = st.text_input("Customer Phone", value="")
 
+    st.subheader("📊 Charts")
+    vega_charts = st.toggle("Render charts in the browser (Vega-Lite)", value=False)
+
 # --- South-Indian Non-Veg Menu ---
 MENU = {
     "Biryanis": [
@@ -93,164 +95,142 @@ MENU = {
     ],
 }
 
+@st.cache_resource
+def menu_catalog():
+    """MENU compiled to item / category / price arrays once per process."""
+    return billing_catalog.MenuCatalog(MENU)
+
+catalog = menu_catalog()
+
 # --- Session ---
-if "quantities" not in st.session_state:
-    st.session_state.quantities = {}
+if "qty" not in st.session_state or len(st.session_state.qty) != len(catalog):
+    st.session_state.qty = catalog.empty_order()   # quantity per catalog item id
 if "last_invoice" not in st.session_state:
     st.session_state.last_invoice = None
 
 # --- Order Form ---
 st.subheader("🧾 Menu & Order")
 with st.form("order_form"):
-    for category, items in MENU.items():
+    for c, category in enumerate(catalog.categories):
         st.markdown(f"#### 🌶️ {category}")
-        for row in items:
-            key = f"qty::{row['item']}"
+        for i in catalog.by_category[c]:
+            name = catalog.items[i]
+            key = f"qty::{name}"
             c1, c2, c3 = st.columns([5, 2, 3])
             with c1:
-                st.write(f"**{row['item']}**")
+                st.write(f"**{name}**")
             with c2:
-                st.write(f"{currency}{row['price']:.2f}")
+                st.write(f"{currency}{catalog.price[i]:.2f}")
             with c3:
                 qty = st.number_input(
-                    f"Qty — {row['item']}",
+                    f"Qty — {name}",
                     min_value=0, max_value=50,
-                    value=st.session_state.quantities.get(row['item'], 0),
+                    value=int(st.session_state.qty[i]),
                     step=1, key=key
                 )
-                st.session_state.quantities[row['item']] = qty
+                st.session_state.qty[i] = qty
         st.divider()
     submitted = st.form_submit_button("🛒 Generate Bill")
 
 # --- Helpers ---
-def build_order_items():
-    items = []
-    for category, rows in MENU.items():
-        for r in rows:
-            name, price = r["item"], r["price"]
-            qty = st.session_state.quantities.get(name, 0)
-            if qty and qty > 0:
-                items.append({
-                    "Category": category,
-                    "Item": name,
-                    "Unit Price": float(price),
-                    "Quantity": int(qty),
-                    "Line Total": float(price) * int(qty),
-                })
-    return items
-
-def make_invoice_number():
-    return "INV-" + datetime.now().strftime("%Y%m%d-%H%M%S")
-
-def compute_totals(items, tax_percent):
-    subtotal = sum(x["Line Total"] for x in items)
-    tax = subtotal * (tax_percent / 100.0)
-    total = subtotal + tax
-    return subtotal, tax, total
+def build_order_items(qty):
+    """Bill table straight from the catalog arrays, one row per ordered item."""
+    return catalog.bill_frame(qty)
+
+@st.cache_resource
+def invoice_sequence():
+    """Shared invoice counter; block=1 keeps numbers gap-free across terminals."""
+    return billing_sequence.InvoiceSequence(block=1)
+
+def make_invoice_number(when=None):
+    return invoice_sequence().invoice_number(when)
+
+def compute_totals(qty, tax_percent):
+    return catalog.totals(qty, tax_percent)
 
 def money(x, cur="₹"):
     return f"{cur}{x:,.2f}"
 
-def make_csv_bytes(df, meta):
-    buf = io.StringIO()
-    buf.write(f"{meta['biz_name']}\n{meta['biz_addr']}\nPhone: {meta['biz_phone']}\n")
-    buf.write(f"Invoice: {meta['invoice_no']}, Date: {meta['date_str']}\n")
-    if meta["customer_name"]: buf.write(f"Customer: {meta['customer_name']}\n")
-    if meta["customer_phone"]: buf.write(f"Customer Phone: {meta['customer_phone']}\n")
-    buf.write("\n")
-    df.to_csv(buf, index=False)
-    buf.write("\n")
-    buf.write(f"Subtotal,{meta['currency']}{meta['subtotal']:.2f}\n")
-    buf.write(f"Tax ({meta['tax_rate']}%),{meta['currency']}{meta['tax']:.2f}\n")
-    buf.write(f"Total,{meta['currency']}{meta['total']:.2f}\n")
-    return buf.getvalue().encode("utf-8")
-
-def make_pdf_bytes(df, meta):
-    if not PDF_AVAILABLE:
-        return None
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=24, bottomMargin=24, leftMargin=24, rightMargin=24)
-    styles = getSampleStyleSheet()
-    story = []
-
-    story.append(Paragraph(meta['biz_name'], styles["Title"]))
-    story.append(Paragraph(meta["biz_addr"], styles["Normal"]))
-    story.append(Paragraph(f"Phone: {meta['biz_phone']}", styles["Normal"]))
-    story.append(Spacer(1, 8))
-
-    story.append(Paragraph(f"<b>Invoice:</b> {meta['invoice_no']} &nbsp;&nbsp; <b>Date:</b> {meta['date_str']}", styles["Normal"]))
-    if meta["customer_name"] or meta["customer_phone"]:
-        s = "<b>Bill To:</b> " + (meta["customer_name"] or "")
-        if meta["customer_phone"]:
-            s += f" &nbsp;&nbsp; <b>Phone:</b> {meta['customer_phone']}"
-        story.append(Paragraph(s, styles["Normal"]))
-    story.append(Spacer(1, 12))
-
-    table_data = [["Item", "Unit Price", "Qty", "Line Total"]]
-    for _, r in df.iterrows():
-        table_data.append([
-            r["Item"],
-            f"{meta['currency']}{float(r['Unit Price']):.2f}",
-            str(int(r["Quantity"])),
-            f"{meta['currency']}{float(r['Line Total']):.2f}",
-        ])
-    tbl = Table(table_data, colWidths=[230, 90, 60, 100])
-    tbl.setStyle(TableStyle([
-        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#eeeeee")),
-        ("GRID", (0,0), (-1,-1), 0.25, colors.gray),
-        ("ALIGN", (1,1), (-1,-1), "RIGHT"),
-        ("FONTNAME", (0,0), (-1,0), "Helvetica-Bold"),
-        ("BOTTOMPADDING", (0,0), (-1,0), 6),
-    ]))
-    story.append(tbl)
-    story.append(Spacer(1, 12))
-
-    totals = [
-        ["Subtotal", f"{meta['currency']}{meta['subtotal']:.2f}"],
-        [f"Tax ({meta['tax_rate']}%)", f"{meta['currency']}{meta['tax']:.2f}"],
-        ["Total", f"{meta['currency']}{meta['total']:.2f}"],
-    ]
-    t2 = Table(totals, colWidths=[230+90+60, 100])
-    t2.setStyle(TableStyle([
-        ("ALIGN", (1,0), (1,-1), "RIGHT"),
-        ("GRID", (0,0), (-1,-1), 0.25, colors.gray),
-        ("BACKGROUND", (0,-1), (-1,-1), colors.HexColor("#f5f5f5")),
-        ("FONTNAME", (0,-1), (-1,-1), "Helvetica-Bold"),
-    ]))
-    story.append(t2)
-    story.append(Spacer(1, 10))
-    story.append(Paragraph("Nandri! Thanks for dining with us. 🍽️", styles["Italic"]))
-    doc.build(story)
-    buffer.seek(0)
-    return buffer.read()
+@st.cache_resource
+def artifact_cache():
+    """Invoice CSV/PDF bytes shared by every session, built once per invoice."""
+    return invoice.ArtifactCache(max_bytes=32 * 1024 * 1024)
+
+@st.cache_resource
+def ledger():
+    """The sales ledger, one SQLite connection per app process."""
+    return billing_ledger.Ledger()
+
+# matplotlib (~0.7 s to import) is loaded by the first chart, not at startup.
+# Charts use Figure objects directly, never pyplot: pyplot's "current figure" is
+# process-global and sessions run in threads, so two sessions could draw into
+# one figure (and st.cache_data would then keep the mixed-up PNG).
+def _figure():
+    from matplotlib.figure import Figure
+    fig = Figure()
+    return fig, fig.subplots()
+
+def _png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
+    return buf.getvalue()
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def category_pie_png(labels, values):
+    fig, ax = _figure()
+    ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=140)
+    ax.set_title("Category Contribution to Revenue")
+    return _png(fig)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def top_dishes_png(labels, values):
+    fig, ax = _figure()
+    ax.bar(labels, values)
+    for label in ax.get_xticklabels():
+        label.set(rotation=30, ha="right")
+    ax.set_ylabel("Revenue")
+    ax.set_title("Top Dishes by Revenue")
+    return _png(fig)
+
+def invoice_file(data, kind):
+    """Cached CSV or PDF bytes for the invoice in `data` (as kept in session state)."""
+    build = invoice.make_pdf_bytes if kind == "pdf" else invoice.make_csv_bytes
+    return artifact_cache().get_or_build(
+        (data["meta"]["invoice_no"], data["hash"], kind),
+        lambda: build(data["df"], data["meta"]))
 
 # --- Generate Bill ---
 if submitted:
-    items = build_order_items()
-    if not items:
+    qty = st.session_state.qty.copy()
+    df = build_order_items(qty)
+    if df.empty:
         st.warning("Please select at least one item (quantity > 0) to generate the bill.")
     else:
-        df = pd.DataFrame(items)
-        invoice_no = "INV-" + datetime.now().strftime("%Y%m%d-%H%M%S")
-        date_str = datetime.now().strftime("%d-%m-%Y %I:%M %p")
-        subtotal, tax, total = compute_totals(items, tax_rate)
-        st.session_state.last_invoice = {
-            "df": df,
-            "meta": {
-                "biz_name": biz_name.strip() or "Restaurant",
-                "biz_addr": biz_addr.strip(),
-                "biz_phone": biz_phone.strip(),
-                "customer_name": customer_name.strip(),
-                "customer_phone": customer_phone.strip(),
-                "invoice_no": invoice_no,
-                "date_str": date_str,
-                "tax_rate": tax_rate,
-                "subtotal": float(subtotal),
-                "tax": float(tax),
-                "total": float(total),
-                "currency": currency,
-            }
+        now = datetime.now()
+        invoice_no = make_invoice_number(now)
+        date_str = now.strftime("%d-%m-%Y %I:%M %p")
+        subtotal, tax, total = compute_totals(qty, tax_rate)
+        meta = {
+            "biz_name": biz_name.strip() or "Restaurant",
+            "biz_addr": biz_addr.strip(),
+            "biz_phone": biz_phone.strip(),
+            "customer_name": customer_name.strip(),
+            "customer_phone": customer_phone.strip(),
+            "invoice_no": invoice_no,
+            "date_str": date_str,
+            "tax_rate": tax_rate,
+            "subtotal": float(subtotal),
+            "tax": float(tax),
+            "total": float(total),
+            "currency": currency,
         }
+        # df and meta are fixed from here on, so the hash is taken once per bill
+        st.session_state.last_invoice = {"df": df, "qty": qty, "meta": meta,
+                                         "hash": invoice.content_hash(df, meta)}
+        try:
+            ledger().record_invoice(df.to_dict("records"), meta, now)
+        except sqlite3.IntegrityError:
+            st.error(f"Invoice {invoice_no} is already in the ledger; this bill was not saved.")
 
 # --- Show Bill + Dashboard ---
 data = st.session_state.last_invoice
@@ -294,37 +274,137 @@ if data:
           <div class="label">Grand Total</div><div class="value">{money(meta['total'], currency)}</div></div>""", unsafe_allow_html=True)
 
     st.markdown("### 📊 Dashboard")
-    # Pie: category contribution
-    cat_sum = df.groupby("Category")["Line Total"].sum().sort_values(ascending=False)
-    fig1 = plt.figure()
-    plt.pie(cat_sum.values, labels=cat_sum.index, autopct="%1.1f%%", startangle=140)
-    plt.title("Category Contribution to Revenue")
-    st.pyplot(fig1, use_container_width=True)
-
-    # Bar: top dishes
-    item_sum = df.groupby("Item")["Line Total"].sum().sort_values(ascending=False).head(8)
-    fig2 = plt.figure()
-    plt.bar(item_sum.index, item_sum.values)
-    plt.xticks(rotation=30, ha="right")
-    plt.ylabel("Revenue")
-    plt.title("Top Dishes by Revenue")
-    st.pyplot(fig2, use_container_width=True)
+    # Charts are keyed by the aggregated numbers, so reruns reuse the rendered image
+    split = catalog.category_split(data["qty"])
+    cat_labels = tuple(name for name, _ in split)
+    cat_values = tuple(rev for _, rev in split)
+    top = catalog.top_items(data["qty"], 8)
+    top_labels = tuple(name for name, _ in top)
+    top_values = tuple(rev for _, rev in top)
+
+    if vega_charts:
+        st.vega_lite_chart(
+            {"values": [{"Category": k, "Revenue": v} for k, v in zip(cat_labels, cat_values)]},
+            {"title": "Category Contribution to Revenue", "mark": {"type": "arc", "tooltip": True},
+             "encoding": {"theta": {"field": "Revenue", "type": "quantitative"},
+                          "color": {"field": "Category", "type": "nominal", "sort": None}}},
+            use_container_width=True)
+        st.vega_lite_chart(
+            {"values": [{"Item": k, "Revenue": v} for k, v in zip(top_labels, top_values)]},
+            {"title": "Top Dishes by Revenue", "mark": {"type": "bar", "tooltip": True},
+             "encoding": {"x": {"field": "Item", "type": "nominal", "sort": "-y", "axis": {"labelAngle": -30}},
+                          "y": {"field": "Revenue", "type": "quantitative"}}},
+            use_container_width=True)
+    else:
+        st.image(category_pie_png(cat_labels, cat_values), use_container_width=True)
+        st.image(top_dishes_png(top_labels, top_values), use_container_width=True)
 
     # Downloads
     st.markdown("### ⬇️ Download Invoice")
-    csv_bytes = make_csv_bytes(df, meta)
     cA, cB = st.columns(2)
     with cA:
-        st.download_button("Download CSV", data=csv_bytes,
+        st.download_button("Download CSV", data=invoice_file(data, "csv"),
                            file_name=f"{meta['invoice_no']}.csv", mime="text/csv",
                            use_container_width=True)
     with cB:
         if PDF_AVAILABLE:
-            pdf_bytes = make_pdf_bytes(df, meta)
-            st.download_button("Download PDF", data=pdf_bytes,
-                               file_name=f"{meta['invoice_no']}.pdf", mime="application/pdf",
-                               use_container_width=True)
+            # the PDF is only laid out once asked for, then served from the cache
+            pdf_key = (meta["invoice_no"], data["hash"])
+            if st.session_state.get("pdf_requested") != pdf_key:
+                if st.button("🧾 Prepare PDF", use_container_width=True):
+                    st.session_state.pdf_requested = pdf_key
+                    st.rerun()
+            else:
+                st.download_button("Download PDF", data=invoice_file(data, "pdf"),
+                                   file_name=f"{meta['invoice_no']}.pdf", mime="application/pdf",
+                                   use_container_width=True)
         else:
             st.info("To enable PDF export, install **reportlab**: `pip install reportlab`")
 else:
     st.info("Choose quantities and click **Generate Bill** to view the dashboard & invoice.")
+
+# --- Sales Ledger ---
+st.markdown("### 📒 Sales Ledger")
+today = date.today()
+period = st.radio("Period", ["Today", "This Month", "Date Range"], horizontal=True)
+if period == "Today":
+    start = end = today
+    sales = ledger().day_sales(today)
+elif period == "This Month":
+    start, end = today.replace(day=1), today
+    sales = ledger().month_sales(today.strftime("%Y-%m"))
+else:
+    picked = st.date_input("From / To", (today.replace(day=1), today))
+    start, end = (picked[0], picked[-1]) if picked else (today, today)
+    sales = ledger().sales_between(start, end)
+
+l1, l2, l3 = st.columns(3)
+with l1:
+    st.markdown(f"""<div class="kpi" style="background:#fce7f3;">
+      <div class="label">🧾 Bills</div><div class="value">{sales['invoices']:,}</div></div>""", unsafe_allow_html=True)
+with l2:
+    st.markdown(f"""<div class="kpi" style="background:#dcfce7;">
+      <div class="label">💰 Revenue</div><div class="value">{money(sales['total'], currency)}</div></div>""", unsafe_allow_html=True)
+with l3:
+    avg = sales["total"] / sales["invoices"] if sales["invoices"] else 0.0
+    st.markdown(f"""<div class="kpi" style="background:#e0f2fe;">
+      <div class="label">Average Bill</div><div class="value">{money(avg, currency)}</div></div>""", unsafe_allow_html=True)
+
+top = ledger().top_items(start, end)
+if top:
+    # plain markdown: st.dataframe would import pandas on every cold session's first run
+    st.markdown("| Item | Quantity | Revenue |\n|:--|--:|--:|\n" + "\n".join(
+        f"| {item} | {qty:,} | {money(rev, currency)} |" for item, qty, rev in top))
+
+# Export ZIPs live in one app-owned temp dir. A session's previous ZIP is removed
+# when it builds a new one; ZIPs left by sessions that ended are swept by age.
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "billing-exports")
+EXPORT_MAX_AGE = 24 * 3600   # seconds
+
+def sweep_exports(now):
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if now - entry.stat().st_mtime > EXPORT_MAX_AGE:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass   # another session swept it first
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+with st.expander("📦 Export invoices as PDFs (ZIP)"):
+    if not PDF_AVAILABLE:
+        st.info("To enable PDF export, install **reportlab**: `pip install reportlab`")
+    else:
+        ex_range = st.date_input("Invoices dated", (today.replace(day=1), today), key="export_range")
+        ex_start, ex_end = (ex_range[0], ex_range[-1]) if ex_range else (today, today)
+        if st.button("Build ZIP", use_container_width=True):
+            # one archive per session: the previous one is removed before building the next
+            previous = st.session_state.pop("export_zip", None)
+            if previous and os.path.exists(previous[0]):
+                os.remove(previous[0])
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            sweep_exports(time.time())
+            bar = st.progress(0.0, text="Rendering PDFs…")
+            def report(done, total, seconds):
+                bar.progress(done / total, text=f"{done:,} / {total:,} invoices · {done / seconds:,.0f}/s")
+            # PDFs are streamed to a temp file as workers return them, not held in memory
+            out = tempfile.NamedTemporaryFile(prefix="invoices-", suffix=".zip", dir=EXPORT_DIR, delete=False)
+            try:
+                with out:
+                    stats = billing_export.export_pdfs(out, ex_start, ex_end, ledger().path, progress=report)
+            except BaseException:
+                os.remove(out.name)
+                raise
+            st.session_state.export_zip = (out.name, f"invoices_{ex_start}_{ex_end}.zip", stats)
+        if st.session_state.get("export_zip") and not os.path.exists(st.session_state.export_zip[0]):
+            del st.session_state.export_zip
+            st.caption("The last export expired; build it again to download.")
+        if st.session_state.get("export_zip"):
+            path, fname, stats = st.session_state.export_zip
+            st.caption(f"{stats['invoices']:,} invoices in {stats['seconds']:.1f}s "
+                       f"({stats['per_second']:,.0f}/s on {stats['workers']} workers)")
+            # deferred: the ZIP is read when the button is clicked, not on every rerun
+            st.download_button("Download ZIP", data=lambda: read_file(path), file_name=fname,
+                               mime="application/zip", use_container_width=True)
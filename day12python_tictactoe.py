@@ -3,10 +3,11 @@
 # Run: streamlit run tic_tac_toe_tn_tournament.py
 
 import random
-import csv
-import io
 import streamlit as st
 
+import tictactoe_engine as engine
+import tictactoe_i18n as i18n
+
 st.set_page_config(page_title="Tic-Tac-Toe — TN Tournament", page_icon="🪷", layout="centered")
 
 # -------------------- THEME --------------------
@@ -68,34 +69,43 @@ st.markdown('<div class="tn-header">🪷 Tic-Tac-Toe — Tamil Nadu Tournament (
 st.caption("Maroon • Saffron • Leaf-Green • Temple-Gold | Kolam-style accents | தமிழ் / English UI")
 
 # -------------------- LANGUAGE --------------------
-LANG = st.sidebar.radio("Language / மொழி", ["English", "தமிழ்"], index=1)
-def T(en, ta): return ta if LANG == "தமிழ்" else en
+# Catalog is built once per process; a rerun only picks the frozen dict for the language.
+LANG_CODES = list(i18n.LANGUAGES)
+LANG = st.sidebar.radio("Language / மொழி", LANG_CODES,
+                        index=LANG_CODES.index(i18n.DEFAULT_LANGUAGE), format_func=i18n.LANGUAGES.get)
+M = i18n.catalog(LANG)
 
 # -------------------- SETTINGS --------------------
-st.sidebar.subheader(T("Settings", "அமைப்புகள்"))
+st.sidebar.subheader(M["settings"])
 mode = st.sidebar.radio(
-    T("Mode", "விளையாட்டு முறை"),
-    [T("Two Players", "இருவர்"), T("Vs Computer (random)", "கணினி எதிர் (random)")]
+    M["mode"],
+    ["two_players", "vs_computer"],
+    format_func=lambda m: M["mode_" + m],
+)
+level = st.sidebar.select_slider(
+    M["computer_strength"],
+    options=list(engine.LEVELS), value="perfect",
+    format_func=lambda lv: M["level_" + lv],
 )
 human_plays = st.sidebar.radio(
-    T("If vs Computer, you play as", "கணினி எதிரில் நீங்கள் ஆடும் அடையாளம்"),
+    M["play_as"],
     ["X", "O"],
     index=0,
     format_func=lambda s: ("❌ X" if s=="X" else "⭕ O")
 )
 
 # -------------------- CONSTANTS --------------------
-X, O, EMPTY = "X", "O", ""
-TOTAL_ROUNDS = 10
+X, O, EMPTY = engine.X, engine.O, engine.EMPTY
+TOTAL_ROUNDS = engine.TOTAL_ROUNDS
 
 # -------------------- STATE INIT --------------------
 def init_single_game():
-    st.session_state.board = [EMPTY]*9
+    st.session_state.game = engine.GameState(3, 3)   # incremental line counts + bitboards
     st.session_state.turn = X
     st.session_state.game_over = False
     st.session_state.winner = None
     st.session_state.winning_line = []
-    st.session_state.status = T("Game on!", "விளையாட்டு தொடங்கியது!")
+    st.session_state.status = ("status_game_on", None)   # (message id, symbol), translated on render
 
 def init_tournament():
     st.session_state.current_round = 1
@@ -109,92 +119,72 @@ if "current_round" not in st.session_state:
     init_tournament()
 
 # -------------------- GAME LOGIC --------------------
-def lines():
-    rows = [[(r,0),(r,1),(r,2)] for r in range(3)]
-    cols = [[(0,c),(1,c),(2,c)] for c in range(3)]
-    diags = [[(0,0),(1,1),(2,2)], [(0,2),(1,1),(2,0)]]
-    return rows + cols + diags
-
 def idx(rc): r,c = rc; return r*3+c
 
-def check_winner(board):
-    for line in lines():
-        a,b,c = [board[idx(p)] for p in line]
-        if a!=EMPTY and a==b==c:
-            return a, line
-    return None, []
-
-def board_full(board): return all(v!=EMPTY for v in board)
+def cell(i): return st.session_state.game.cells[i]
 def sym_to_emoji(s): return "❌" if s=="X" else ("⭕" if s=="O" else " ")
 
 def place(i, sym):
     if st.session_state.game_over: return False
-    if st.session_state.board[i]==EMPTY:
-        st.session_state.board[i]=sym
-        return True
-    return False
+    try:
+        st.session_state.game.play(i, sym)
+    except ValueError:
+        return False
+    return True
 
 def after_move():
-    w, line = check_winner(st.session_state.board)
+    # only the lines through the last move are re-counted, inside GameState.play()
+    game = st.session_state.game
+    w = game.winner
     if w:
         st.session_state.game_over=True
         st.session_state.winner=w
-        st.session_state.winning_line=line
-        st.session_state.status = (T("wins!", "வெற்றி!") + f" {sym_to_emoji(w)}")
+        st.session_state.winning_line=list(game.winning_line)
+        st.session_state.status = ("status_wins", w)
         record_round_result()
         return
-    if board_full(st.session_state.board):
+    if game.full:
         st.session_state.game_over=True
         st.session_state.winner=None
         st.session_state.winning_line=[]
-        st.session_state.status = T("It's a draw!", "டிரா!")
+        st.session_state.status = ("status_draw", None)
         record_round_result()
         return
     st.session_state.turn = O if st.session_state.turn==X else X
-    st.session_state.status = T("to move", "ஆட வேண்டியது") + f" {sym_to_emoji(st.session_state.turn)}"
+    st.session_state.status = ("status_to_move", st.session_state.turn)
 
 def record_round_result():
-    # Count moves
-    move_count = sum(1 for v in st.session_state.board if v in (X,O))
-    flat_board = "".join(st.session_state.board)  # snapshot
+    result = engine.round_result(st.session_state.current_round, *st.session_state.game.bitboards)
     # Update counters
-    if st.session_state.winner == X:
+    if result["outcome"] == X:
         st.session_state.x_wins += 1
-        outcome = "X"
-    elif st.session_state.winner == O:
+    elif result["outcome"] == O:
         st.session_state.o_wins += 1
-        outcome = "O"
     else:
         st.session_state.draws += 1
-        outcome = "Draw"
-
-    st.session_state.results.append({
-        "round": st.session_state.current_round,
-        "outcome": outcome,
-        "moves": move_count,
-        "board": flat_board,
-        "winning_line": st.session_state.winning_line
-    })
+    st.session_state.results.append(result)
 
 # -------------------- HEADER INFO --------------------
 k1, k2, k3, k4 = st.columns(4)
-k1.markdown(f'<div class="kpi">🎯 {T("Round", "சுற்று")}: {st.session_state.current_round} / {TOTAL_ROUNDS}</div>', unsafe_allow_html=True)
+k1.markdown(f'<div class="kpi">🎯 {M["round"]}: {st.session_state.current_round} / {TOTAL_ROUNDS}</div>', unsafe_allow_html=True)
 k2.markdown(f'<div class="kpi">❌ X: {st.session_state.x_wins}</div>', unsafe_allow_html=True)
 k3.markdown(f'<div class="kpi">⭕ O: {st.session_state.o_wins}</div>', unsafe_allow_html=True)
-k4.markdown(f'<div class="kpi">🤝 {T("Draws","டிரா")}: {st.session_state.draws}</div>', unsafe_allow_html=True)
+k4.markdown(f'<div class="kpi">🤝 {M["draws"]}: {st.session_state.draws}</div>', unsafe_allow_html=True)
 
 # -------------------- CONTROLS --------------------
 cA, cB = st.columns(2)
-if cA.button(T("Reset Game (current round)", "இந்த சுற்று ரீசெட்") + " 🔄"):
+if cA.button(M["reset_game"] + " 🔄"):
     init_single_game()
     st.rerun()
-if cB.button(T("Reset Tournament (all 10 rounds)", "முழு 10 சுற்று ரீசெட்") + " 🧹"):
+if cB.button(M["reset_tournament"] + " 🧹"):
     init_tournament()
     st.rerun()
 
 # -------------------- STATUS --------------------
-st.subheader(T("Status", "நிலை"))
-st.markdown(f'<div class="status">{sym_to_emoji(st.session_state.turn)} {st.session_state.status}</div>', unsafe_allow_html=True)
+st.subheader(M["status"])
+status_id, status_sym = st.session_state.status
+status_text = M[status_id] + (f" {sym_to_emoji(status_sym)}" if status_sym else "")
+st.markdown(f'<div class="status">{sym_to_emoji(st.session_state.turn)} {status_text}</div>', unsafe_allow_html=True)
 st.write("")
 
 # -------------------- GAME ACTIVE? --------------------
@@ -207,8 +197,9 @@ if not tournament_over:
         cols = st.columns(3, gap="small")
         for c in range(3):
             i = r*3+c
-            label = sym_to_emoji(st.session_state.board[i]) if st.session_state.board[i] else " "
-            disabled = st.session_state.game_over or st.session_state.board[i]!=EMPTY
+            v = cell(i)
+            label = sym_to_emoji(v) if v else " "
+            disabled = st.session_state.game_over or v!=EMPTY
             if cols[c].button(label, key=f"cell-{st.session_state.current_round}-{i}", use_container_width=True, disabled=disabled):
                 clicked = i
 
@@ -216,18 +207,18 @@ if not tournament_over:
 if not tournament_over and clicked is not None:
     if place(clicked, st.session_state.turn):
         after_move()
-        # Computer random move if applicable
-        if (mode.startswith("Vs") or mode.startswith("கணினி")) and not st.session_state.game_over:
+        # Computer move if applicable (table lookup, the game tree is solved on import)
+        if mode == "vs_computer" and not st.session_state.game_over:
             if st.session_state.turn != human_plays:
-                empties = [i for i,v in enumerate(st.session_state.board) if v==EMPTY]
-                if empties:
-                    comp_i = random.choice(empties)
+                position = st.session_state.game.bitboards
+                if engine.legal_moves(*position):
+                    comp_i = engine.computer_move(*position, level, random)
                     place(comp_i, st.session_state.turn)
                     after_move()
 
 # -------------------- FINAL BOARD + NEXT ROUND --------------------
 if st.session_state.game_over and not tournament_over:
-    st.markdown(T("### Final Board (This Round)", "### இந்த சுற்றின் இறுதி பலகை"))
+    st.markdown(M["final_board"])
     win_cells = set(idx(p) for p in st.session_state.winning_line)
 
     css_class = "draw" if st.session_state.winner is None else ""
@@ -235,7 +226,7 @@ if st.session_state.game_over and not tournament_over:
         cols = st.columns(3, gap="small")
         for c in range(3):
             i = r*3+c
-            val = sym_to_emoji(st.session_state.board[i]) if st.session_state.board[i] else " "
+            val = sym_to_emoji(cell(i)) if cell(i) else " "
             klass = "cellbox win" if i in win_cells else f"cellbox {css_class}"
             cols[c].markdown(f'<div class="{klass}">{val}</div>', unsafe_allow_html=True)
 
@@ -243,51 +234,38 @@ if st.session_state.game_over and not tournament_over:
     def next_round():
         st.session_state.current_round += 1
         init_single_game()
-    st.button(T("Next Round ▶️", "அடுத்த சுற்று ▶️"), type="primary", on_click=next_round)
+    st.button(M["next_round"], type="primary", on_click=next_round)
 
 # -------------------- TOURNAMENT OVER? SHOW REPORT --------------------
 if tournament_over:
-    st.markdown("## 🏁 " + T("Tournament Finished — Final Report", "டூர்ணமெண்ட் முடிந்தது — இறுதி அறிக்கை"))
+    st.markdown("## 🏁 " + M["tournament_finished"])
 
     x, o, d = st.session_state.x_wins, st.session_state.o_wins, st.session_state.draws
     total = x + o + d if (x+o+d)>0 else 1
-    champ = T("Draw (Tie)", "டிரா (சமநிலை)")
-    if x > o: champ = "❌ X"
-    elif o > x: champ = "⭕ O"
+    champ = {X: "❌ X", O: "⭕ O"}.get(engine.champion(x, o), M["draw_tie"])
 
     c1, c2, c3, c4 = st.columns(4)
     c1.markdown(f'<div class="kpi">❌ X Wins: {x} ({x*100//total}%)</div>', unsafe_allow_html=True)
     c2.markdown(f'<div class="kpi">⭕ O Wins: {o} ({o*100//total}%)</div>', unsafe_allow_html=True)
-    c3.markdown(f'<div class="kpi">🤝 {T("Draws","டிரா")}: {d} ({d*100//total}%)</div>', unsafe_allow_html=True)
-    c4.markdown(f'<div class="kpi">🏆 {T("Champion","சாம்பியன்")}: {champ}</div>', unsafe_allow_html=True)
+    c3.markdown(f'<div class="kpi">🤝 {M["draws"]}: {d} ({d*100//total}%)</div>', unsafe_allow_html=True)
+    c4.markdown(f'<div class="kpi">🏆 {M["champion"]}: {champ}</div>', unsafe_allow_html=True)
 
     # Round-wise table
-    st.markdown("### " + T("Round-wise Results", "சுற்று வாரியான முடிவுகள்"))
+    st.markdown("### " + M["round_results"])
     # Build a small readable table
-    def board_pretty(b):  # b is "XXO...O"
-        return " | ".join([b[i] or "-" for i in range(9)])
+    def board_pretty(b):  # b is "XXO-O----", '-' = empty
+        return " | ".join(b)
+    header = i18n.report_header(LANG)
     rows = []
     for r in st.session_state.results:
         wl = ",".join([f"({a},{b})" for (a,b) in r["winning_line"]]) if r["winning_line"] else "-"
-        rows.append({
-            T("Round","சுற்று"): r["round"],
-            T("Outcome","முடிவு"): r["outcome"],
-            T("Moves","நடவடிக்கை"): r["moves"],
-            T("Winning Line","வெற்றி வரி"): wl,
-            T("Board (r1-3,c1-3)","பலகை"): board_pretty(r["board"])
-        })
+        rows.append(dict(zip(header, (r["round"], r["outcome"], r["moves"], wl, board_pretty(r["board"])))))
     st.dataframe(rows, use_container_width=True)
 
     # CSV download
-    csv_buf = io.StringIO()
-    writer = csv.writer(csv_buf)
-    writer.writerow(["round","outcome","moves","winning_line","board"])
-    for r in st.session_state.results:
-        wl = ";".join([f"{a}-{b}" for (a,b) in r["winning_line"]]) if r["winning_line"] else ""
-        writer.writerow([r["round"], r["outcome"], r["moves"], wl, r["board"]])
     st.download_button(
-        label=T("Download Final Report (CSV)", "இறுதி அறிக்கை பதிவிறக்கு (CSV)"),
-        data=csv_buf.getvalue().encode("utf-8"),
+        label=M["download_report"],
+        data=engine.report_csv(st.session_state.results).encode("utf-8"),
         file_name="tictactoe_tournament_report.csv",
         mime="text/csv",
         use_container_width=True
@@ -295,7 +273,4 @@ if tournament_over:
 
 # -------------------- FOOTER --------------------
 st.markdown("---")
-st.markdown(T(
-    "Tip: Switch தமிழ் / English from the sidebar. Reset just this round or the whole tournament anytime.",
-    "குறிப்பு: பக்கப்பட்டியில் தமிழ் / English மாற்றலாம். இந்த சுற்றை மட்டும் அல்லது முழு 10 சுற்றையும் ரீசெட் செய்யலாம்."
-))
+st.markdown(M["tip"])
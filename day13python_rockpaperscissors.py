@@ -5,6 +5,8 @@
 import random
 import streamlit as st
 
+import rps_engine as engine
+
 st.set_page_config(page_title="Rock, Paper, Scissors", page_icon="✊", layout="centered")
 
 # ---------- DARK THEME + SELECTBOX FIX ----------
@@ -87,25 +89,28 @@ a, a:visited { color: #fde047 !important; }
 
 # ---------- Game constants ----------
 CHOICES = {"Rock": "✊", "Paper": "✋", "Scissors": "✌️"}
+RESULT_TEXT = {engine.DRAW: "Draw 🤝", engine.USER_WINS: "You Win 🎉", engine.COMP_WINS: "Computer Wins 💻"}
+ENDLESS = 0          # max_rounds value for endless mode
+HISTORY_PAGE = 10    # rounds per history page
 
 # ---------- Initialize state ----------
-if "user_score" not in st.session_state:
-    st.session_state.user_score = 0
-    st.session_state.comp_score = 0
-    st.session_state.rounds = []           # list of dicts with results
-    st.session_state.round_number = 1
+if "log" not in st.session_state:
+    st.session_state.log = engine.RoundLog()   # ring of compact rounds + running scores
     st.session_state.last_result = "Start the game!"
     st.session_state.tournament_over = False
+if "model" not in st.session_state:
+    # learns the player's habits; kept across tournament resets
+    st.session_state.model = engine.MarkovPredictor(order=3)
 
 # ---------- Sidebar ----------
 st.sidebar.header("⚙️ Tournament Settings")
-max_rounds = st.sidebar.selectbox("Select total rounds:", [5, 7, 10], index=2)  # default 10
+max_rounds = st.sidebar.selectbox("Select total rounds:", [5, 7, 10, ENDLESS], index=2,  # default 10
+                                  format_func=lambda n: "Endless ♾️" if n == ENDLESS else str(n))
+opponent = st.sidebar.radio("Computer plays:", ["Random", "Adaptive"],
+                            help="Adaptive predicts your next move from your recent moves.")
 
 def reset_tournament():
-    st.session_state.user_score = 0
-    st.session_state.comp_score = 0
-    st.session_state.rounds = []
-    st.session_state.round_number = 1
+    st.session_state.log = engine.RoundLog()
     st.session_state.last_result = "Game reset. Start again!"
     st.session_state.tournament_over = False
 
@@ -113,40 +118,45 @@ if st.sidebar.button("🔄 Reset Tournament"):
     reset_tournament()
     st.rerun()
 
+st.sidebar.markdown("### 📈 Win chances")
+chances_box = st.sidebar.empty()   # filled at the end of the run, after this click's round is scored
+
 # ---------- Helpers ----------
 def play(user_choice: str):
     """Play one round if tournament not over."""
     if st.session_state.tournament_over:
         return
 
-    comp_choice = random.choice(list(CHOICES.keys()))
-
-    if user_choice == comp_choice:
-        result_text = "Draw 🤝"
-    elif (user_choice == "Rock" and comp_choice == "Scissors") \
-         or (user_choice == "Paper" and comp_choice == "Rock") \
-         or (user_choice == "Scissors" and comp_choice == "Paper"):
-        result_text = "You Win 🎉"
-        st.session_state.user_score += 1
+    model = st.session_state.model
+    if opponent == "Adaptive":
+        comp_choice = engine.MOVES[engine.adaptive_move(model)]
     else:
-        result_text = "Computer Wins 💻"
-        st.session_state.comp_score += 1
-
-    st.session_state.rounds.append({
-        "Round": st.session_state.round_number,
-        "You": f"{CHOICES[user_choice]} {user_choice}",
-        "Computer": f"{CHOICES[comp_choice]} {comp_choice}",
-        "Result": result_text
-    })
+        comp_choice = random.choice(list(CHOICES.keys()))
+    model.update(engine.MOVES.index(user_choice))   # O(order), always learning
+
+    log = st.session_state.log
+    outcome = log.append(engine.MOVES.index(user_choice), engine.MOVES.index(comp_choice))
     st.session_state.last_result = (
-        f"You: {CHOICES[user_choice]}  |  Computer: {CHOICES[comp_choice]}  →  **{result_text}**"
+        f"You: {CHOICES[user_choice]}  |  Computer: {CHOICES[comp_choice]}  →  **{RESULT_TEXT[outcome]}**"
     )
-    st.session_state.round_number += 1
 
     # End tournament after max rounds are played
-    if st.session_state.round_number > max_rounds:
+    if max_rounds != ENDLESS and log.total >= max_rounds:
         st.session_state.tournament_over = True
 
+def move_label(m: int) -> str:
+    name = engine.MOVES[m]
+    return f"{CHOICES[name]} {name}"
+
+SIM_TOURNAMENTS = 100_000
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def win_chances(rounds_left, user_score, comp_score, user_mix, comp_mix):
+    """Champion probabilities from the current score, by batch simulation (~1M rounds, tens of ms)."""
+    res = engine.simulate(SIM_TOURNAMENTS, rounds_left, engine.mixed(user_mix), engine.mixed(comp_mix),
+                          seed=0, start=(user_score, comp_score))
+    return res["champion"]
+
 def reset_game_only():
     """Reset scores and rounds but keep settings."""
     reset_tournament()
@@ -156,10 +166,11 @@ st.title("✊✋✌️ Rock – Paper – Scissors")
 st.caption("Dark theme • All text white • Yellow buttons • Tournament mode")
 
 # Scoreboard
+log = st.session_state.log
 c1, c2, c3 = st.columns(3)
-c1.metric("👤 You", st.session_state.user_score)
-c2.metric("💻 Computer", st.session_state.comp_score)
-c3.metric("🎯 Round", f"{st.session_state.round_number-1}/{max_rounds}")
+c1.metric("👤 You", log.user_wins)
+c2.metric("💻 Computer", log.comp_wins)
+c3.metric("🎯 Round", f"{log.total}/{max_rounds or '∞'}")
 
 # Make a move
 st.subheader("Make your move:")
@@ -175,20 +186,48 @@ if bcols[2].button("✌️ Scissors"):
 st.markdown("### 🎯 Last Result")
 st.write(st.session_state.last_result)
 
-# Round history
-if st.session_state.rounds:
+# Round history: only the visible page is decoded and sent, latest first
+if log.total:
     st.markdown("### 📜 Round History")
-    st.table(st.session_state.rounds[::-1])  # latest first
+    pages = -(-len(log) // HISTORY_PAGE)
+    if pages > 1:
+        # keyed so the page survives max_value growing; clamped after a reset shrinks the log
+        st.session_state.history_page = min(st.session_state.get("history_page", 1), pages)
+        page = st.number_input("Page", min_value=1, max_value=pages, key="history_page")
+    else:
+        page = 1
+    st.table([
+        {"Round": n, "You": move_label(u), "Computer": move_label(c), "Result": RESULT_TEXT[o]}
+        for n, u, c, o in log.latest((page - 1) * HISTORY_PAGE, HISTORY_PAGE)
+    ])
+    if log.total > len(log):
+        st.caption(f"Showing the last {len(log):,} of {log.total:,} rounds.")
 
 # Tournament over summary
 if st.session_state.tournament_over:
     st.markdown("## 🏆 Tournament Over")
-    if st.session_state.user_score > st.session_state.comp_score:
+    if log.user_wins > log.comp_wins:
         champ = "🎉 You are the Champion!"
-    elif st.session_state.comp_score > st.session_state.user_score:
+    elif log.comp_wins > log.user_wins:
         champ = "💻 Computer is the Champion!"
     else:
         champ = "🤝 It's a Draw!"
     st.success(champ)
 
     st.button("🔄 Play Again", on_click=reset_game_only)
+
+# ---------- Win chances (sidebar) ----------
+# You play your move mix so far; the adaptive computer is approximated by
+# countering that mix. Mixes are rounded so reruns mostly hit the cache.
+user_mix = tuple(round(p, 2) for p in st.session_state.model.move_mix())
+comp_mix = (1, 1, 1) if opponent == "Random" else tuple(user_mix[engine.BEATS.index(m)] for m in range(3))
+if max_rounds == ENDLESS:
+    chances_box.caption("No final round in endless mode.")
+else:
+    rounds_left = max(0, max_rounds - log.total)
+    ch = win_chances(rounds_left, log.user_wins, log.comp_wins, user_mix, comp_mix)
+    chances_box.markdown(
+        f"👤 You **{ch['user']:.0%}** · 💻 Computer **{ch['comp']:.0%}** · 🤝 Draw **{ch['draw']:.0%}**  \n"
+        f"<small>{SIM_TOURNAMENTS:,} simulated {max_rounds}-round tournaments from the current score</small>",
+        unsafe_allow_html=True,
+    )
@@ -1,48 +1,45 @@
 # snake_streamlit.py
-import random
+import csv
+import io
+import struct
 import time
-from typing import List, Tuple
+from collections import deque
 
 import numpy as np
 import streamlit as st
+from PIL import Image
 
-st.set_page_config(page_title="Snake 🐍 – Streamlit", page_icon="🐍", layout="wide")
+import snake_autopilot as autopilot
+import snake_engine as engine
+import snake_replay as replay
 
-Cell = Tuple[int, int]
+st.set_page_config(page_title="Snake 🐍 – Streamlit", page_icon="🐍", layout="wide")
 
 # -------------------- State --------------------
+# Game rules live in snake_engine and operate on st.session_state directly;
+# this file only adds the UI fields around them.
 def init_state():
-    g = 22  # grid size
-    st.session_state.grid = g
+    engine.init_game(st.session_state, grid=22)
     st.session_state.cell_px = 24
-    # 3-long snake centered, facing right
-    st.session_state.snake = [(g//2 + i, g//2) for i in range(0, -3, -1)]
-    st.session_state.dir = (1, 0)
-    st.session_state.pending_dir = (1, 0)
-    st.session_state.food = spawn_food()
-    st.session_state.score = 0
     st.session_state.speed = 0.20      # slower default so it’s playable
     st.session_state.is_running = False  # start paused; press Start
-    st.session_state.game_over = False
     st.session_state.keybox = ""
     st.session_state.countdown = 0      # 3..2..1 Start
+    st.session_state.frame = None       # (grid, cell_px), last image, painted cells
+    st.session_state.autopilot_path = None
+    st.session_state.recorder = replay.ReplayRecorder(st.session_state.grid, st.session_state.seed)
+    st.session_state.perf = deque(maxlen=5000)   # per-tick timings, see PERF_COLUMNS
+    st.session_state.perf_last = None            # (tick, time) of the previous logged tick
 
-def spawn_food() -> Cell:
-    g = st.session_state.grid
-    snake = set(st.session_state.snake)
-    while True:
-        p = (random.randint(0, g-1), random.randint(0, g-1))
-        if p not in snake:
-            return p
+def valid_turn(new_dir: engine.Cell) -> bool:
+    return engine.valid_turn(st.session_state, new_dir)
 
-def valid_turn(new_dir: Cell) -> bool:
-    cx, cy = st.session_state.dir
-    nx, ny = new_dir
-    return (nx, ny) != (-cx, -cy)
+def turn(new_dir: engine.Cell):
+    engine.turn(st.session_state, new_dir)
+    forget_autopilot_path()   # a manual move breaks the planned path's tail-safety
 
-def turn(new_dir: Cell):
-    if valid_turn(new_dir):
-        st.session_state.pending_dir = new_dir
+def forget_autopilot_path():
+    st.session_state.autopilot_path = None
 
 def restart():
     init_state()
@@ -56,69 +53,79 @@ def start_with_countdown():
 if "grid" not in st.session_state:
     init_state()
 
-# -------------------- Game step (with correct tail rule) --------------------
+# -------------------- Game step --------------------
 def step():
     if st.session_state.game_over or not st.session_state.is_running:
         return
+    if st.session_state.autopilot:
+        autopilot.steer(st.session_state)
+    engine.step(st.session_state)
+    st.session_state.recorder.record(st.session_state)
+    if st.session_state.game_over:
+        st.session_state.is_running = False
+        st.session_state.last_replay = st.session_state.recorder.to_bytes()
 
-    g = st.session_state.grid
-    snake: List[Cell] = st.session_state.snake
+# -------------------- Drawing --------------------
+BASE1, BASE2 = (28, 26, 68), (32, 30, 84)   # checkerboard colours
+GRID_LINE = 50
+FOOD_COLOR = (235, 64, 90)
+BODY_COLOR, HEAD_COLOR = (34, 200, 160), (80, 255, 180)
 
-    # apply direction chosen by user this tick
-    st.session_state.dir = st.session_state.pending_dir
-    dx, dy = st.session_state.dir
-    hx, hy = snake[0]
-    new_head = (hx + dx, hy + dy)
+@st.cache_resource(show_spinner=False)
+def board_background(g: int, c: int) -> np.ndarray:
+    """Checkerboard + grid lines, built once per (grid, cell_px) and shared read-only."""
+    ys, xs = np.indices((g, g))
+    parity = ((xs + ys) % 2).repeat(c, axis=0).repeat(c, axis=1)
+    img = np.where(parity[..., None] == 0,
+                   np.array(BASE1, dtype=np.uint8), np.array(BASE2, dtype=np.uint8))
+    img[::c, :, :] = GRID_LINE
+    img[:, ::c, :] = GRID_LINE
+    img.setflags(write=False)
+    return img
 
-    # wall collision
-    if not (0 <= new_head[0] < g and 0 <= new_head[1] < g):
-        st.session_state.game_over = True
-        st.session_state.is_running = False
-        return
+@st.cache_resource(show_spinner=False)
+def cell_tiles(c: int) -> dict:
+    """Pre-painted c×c tiles for food, snake body and snake head."""
+    def tile(color, inner=True):
+        t = np.empty((c, c, 3), dtype=np.uint8)
+        t[...] = color
+        if inner:
+            t[4:-4, 4:-4] = np.clip(np.array(color) + 20, 0, 255)
+        return t
+    return {"food": tile(FOOD_COLOR, inner=False), "body": tile(BODY_COLOR), "head": tile(HEAD_COLOR)}
 
-    will_grow = (new_head == st.session_state.food)
+def draw_board(s=None, reuse: bool = True) -> np.ndarray:
+    """Compose a frame from the cached background, stamping only cells that changed.
 
-    # self collision (allow stepping onto tail if it will move this tick)
-    body_to_check = snake if will_grow else snake[:-1]
-    if new_head in body_to_check:
-        st.session_state.game_over = True
-        st.session_state.is_running = False
-        return
+    With ``reuse`` the previous frame buffer is patched in place: cells that are no
+    longer painted get the background back, cells whose paint changed get a tile.
+    `s` is the game state to draw (the live game by default, or a replay state).
+    """
+    s = st.session_state if s is None else s
+    g, c = s["grid"], st.session_state.cell_px
+    bg = board_background(g, c)
+    tiles = cell_tiles(c)
 
-    # move snake
-    snake.insert(0, new_head)
-    if will_grow:
-        st.session_state.score += 1
-        st.session_state.food = spawn_food()
+    food = s["food"]
+    want = {} if food is None else {food: "food"}
+    want.update(dict.fromkeys(s["snake"], "body"))
+    want[s["snake"][0]] = "head"
+
+    prev = s.get("frame")
+    if reuse and prev is not None and prev[0] == (g, c):
+        _, img, painted = prev
+        for i in painted.keys() - want.keys():
+            y, x = divmod(i, g)
+            img[y*c:(y+1)*c, x*c:(x+1)*c] = bg[y*c:(y+1)*c, x*c:(x+1)*c]
+        dirty = want.items() - painted.items()
     else:
-        snake.pop()
+        img = bg.copy()
+        dirty = want.items()
 
-# -------------------- Drawing --------------------
-def draw_board() -> np.ndarray:
-    g, c = st.session_state.grid, st.session_state.cell_px
-    H, W = g*c, g*c
-    img = np.zeros((H, W, 3), dtype=np.uint8)
-
-    # colorful checkerboard
-    base1, base2 = np.array([28, 26, 68]), np.array([32, 30, 84])
-    for y in range(g):
-        for x in range(g):
-            img[y*c:(y+1)*c, x*c:(x+1)*c] = base1 if (x+y) % 2 == 0 else base2
-    img[::c, :, :] = 50
-    img[:, ::c, :] = 50
-
-    # food
-    fx, fy = st.session_state.food
-    img[fy*c:(fy+1)*c, fx*c:(fx+1)*c] = [235, 64, 90]
-
-    # snake
-    for i, (sx, sy) in enumerate(st.session_state.snake):
-        color = np.array([34, 200, 160]) if i > 0 else np.array([80, 255, 180])
-        block = img[sy*c:(sy+1)*c, sx*c:(sx+1)*c]
-        block[...] = color
-        inner = block[4:-4, 4:-4]
-        if inner.size > 0:
-            inner[...] = np.clip(color + 20, 0, 255)
+    for i, kind in dirty:
+        y, x = divmod(i, g)
+        img[y*c:(y+1)*c, x*c:(x+1)*c] = tiles[kind]
+    s["frame"] = ((g, c), img, want)
     return img
 
 # -------------------- Sidebar --------------------
@@ -140,6 +147,11 @@ with st.sidebar:
 
     st.slider("Speed (lower = faster)", 0.05, 0.40, st.session_state.speed, 0.01, key="speed")
     st.button("🔄 Restart", use_container_width=True, on_click=restart)
+    st.toggle("🤖 Autopilot (BFS to food, tail-safe)", key="autopilot", value=False,
+              on_change=forget_autopilot_path)
+    st.toggle("⏱️ Performance HUD", key="show_hud", value=False)
+    st.toggle("⚡ Live board (ticks without full-page reruns)", key="live_board",
+              value=hasattr(st, "fragment"), disabled=not hasattr(st, "fragment"))
 
 # -------------------- Header --------------------
 st.markdown(
@@ -155,63 +167,192 @@ st.markdown(
     unsafe_allow_html=True,
 )
 st.title("🐍 Snake — Streamlit Edition")
-state_text = ("Game Over" if st.session_state.game_over
-              else ("Running" if st.session_state.is_running else "Paused"))
-st.markdown(
-    f"<span class='badge score'>Score: {st.session_state.score}</span>"
-    f"<span class='badge state'>{state_text}</span>",
-    unsafe_allow_html=True,
-)
 
-# Start / Pause / Resume controls
-ctrl = st.columns([1,1,1])
-with ctrl[0]:
-    st.button("🚀 Start", use_container_width=True, on_click=start_with_countdown,
-              disabled=st.session_state.is_running and not st.session_state.game_over)
-with ctrl[1]:
-    if not st.session_state.game_over:
-        if st.session_state.is_running:
-            st.button("⏸ Pause", use_container_width=True,
-                      on_click=lambda: st.session_state.update(is_running=False))
-        else:
-            st.button("▶ Resume", use_container_width=True,
-                      on_click=lambda: st.session_state.update(is_running=True))
-
-# -------------------- D-Pad Buttons --------------------
-top = st.columns([1,1,1,2,1,1,1])
-with top[1]:
-    st.button("⬆️ Up", use_container_width=True, on_click=turn, args=((0, -1),))
-row = st.columns([1,1,1,2,1,1,1])
-with row[0]:
-    st.button("⬅️ Left", use_container_width=True, on_click=turn, args=((-1, 0),))
-with row[2]:
-    st.button("➡️ Right", use_container_width=True, on_click=turn, args=((1, 0),))
-with row[4]:
-    st.button("⬇️ Down", use_container_width=True, on_click=turn, args=((0, 1),))
-
-# -------------------- Countdown / Tick / Render --------------------
-# Countdown overlay
-if st.session_state.countdown > 0:
+# -------------------- Game panel --------------------
+COUNTDOWN_SECS = 0.6
+
+def tick_interval():
+    """How often the live panel re-runs itself (None = only on interaction)."""
+    if st.session_state.countdown > 0:
+        return COUNTDOWN_SECS
+    if st.session_state.is_running and not st.session_state.game_over:
+        return st.session_state.speed
+    return None
+
+def render_board():
+    """Draw and PNG-encode the board ourselves so both costs can be timed; returns (draw_ms, encode_ms)."""
+    t0 = time.perf_counter()
     board = draw_board()
-    st.image(board, width=st.session_state.grid * st.session_state.cell_px)
-    st.warning(f"Starting in {st.session_state.countdown}…")
-    time.sleep(0.6)
-    st.session_state.countdown -= 1
-    if st.session_state.countdown == 0:
-        st.session_state.is_running = True
-    st.rerun()
-
-# Advance one tick
-if st.session_state.is_running and not st.session_state.game_over:
-    step()
-
-# Render board
-board = draw_board()
-st.image(board, width=st.session_state.grid * st.session_state.cell_px)
-
-# Game over or keep running
-if st.session_state.game_over:
-    st.error("💥 **Game Over!** Press **Restart** or **Start** to play again.")
+    t1 = time.perf_counter()
+    buf = io.BytesIO()
+    Image.fromarray(board).save(buf, format="PNG")
+    t2 = time.perf_counter()
+    st.image(buf.getvalue(), width=st.session_state.grid * st.session_state.cell_px)
+    return (t1 - t0) * 1000, (t2 - t1) * 1000
+
+# -------------------- Instrumentation --------------------
+PERF_COLUMNS = ("tick", "step_ms", "draw_ms", "encode_ms", "interval_ms", "target_ms")
+
+def log_tick(step_ms, draw_ms, encode_ms, now):
+    """Append one row; interval_ms is only known when the previous tick was logged too."""
+    tick, last = st.session_state.tick, st.session_state.perf_last
+    interval_ms = (now - last[1]) * 1000 if last and last[0] == tick - 1 else None
+    st.session_state.perf.append(
+        (tick, step_ms, draw_ms, encode_ms, interval_ms, st.session_state.speed * 1000))
+    st.session_state.perf_last = (tick, now)
+
+def perf_hud(window: int = 200):
+    rows = list(st.session_state.perf)[-window:]
+    if not rows:
+        st.caption("No ticks recorded yet — start a game.")
+        return
+    cols = list(zip(*rows))
+
+    def mean_p95(i):
+        vals = sorted(v for v in cols[i] if v is not None)
+        if not vals:
+            return 0.0, 0.0
+        return sum(vals) / len(vals), vals[min(len(vals) - 1, int(len(vals) * 0.95))]
+
+    m = st.columns(4)
+    for col, (label, i) in zip(m, (("step()", 1), ("draw_board()", 2), ("PNG encode", 3))):
+        mean, p95 = mean_p95(i)
+        col.metric(label, f"{mean:.2f} ms", f"p95 {p95:.2f} ms", delta_color="off")
+    mean, _ = mean_p95(4)
+    target = cols[5][-1]
+    m[3].metric("Tick interval", f"{mean:.0f} ms", f"{mean - target:+.0f} ms vs speed",
+                delta_color="inverse")
+    st.line_chart({
+        "step": cols[1], "draw": cols[2], "encode": cols[3],
+        "jitter": [None if v is None else v - t for v, t in zip(cols[4], cols[5])],
+    }, height=180)
+
+def game_panel(live: bool):
+    """Badges, controls, D-pad and board.
+
+    In live mode this runs as a fragment on its own timer, so a tick (or a D-pad
+    click) re-runs only this panel instead of the whole script. Whenever the
+    cadence has to change (countdown, start, pause, game over) it asks for one
+    full rerun so the fragment is re-registered with the new interval.
+    """
+    if live and tick_interval() != st.session_state.live_every:
+        st.rerun()
+
+    state_text = ("You Win!" if st.session_state.won
+                  else "Game Over" if st.session_state.game_over
+                  else ("Running" if st.session_state.is_running else "Paused"))
+    st.markdown(
+        f"<span class='badge score'>Score: {st.session_state.score}</span>"
+        f"<span class='badge state'>{state_text}</span>",
+        unsafe_allow_html=True,
+    )
+
+    # Start / Pause / Resume controls
+    ctrl = st.columns([1,1,1])
+    with ctrl[0]:
+        st.button("🚀 Start", use_container_width=True, on_click=start_with_countdown,
+                  disabled=st.session_state.is_running and not st.session_state.game_over)
+    with ctrl[1]:
+        if not st.session_state.game_over:
+            if st.session_state.is_running:
+                st.button("⏸ Pause", use_container_width=True,
+                          on_click=lambda: st.session_state.update(is_running=False))
+            else:
+                st.button("▶ Resume", use_container_width=True,
+                          on_click=lambda: st.session_state.update(is_running=True))
+
+    # D-Pad Buttons
+    top = st.columns([1,1,1,2,1,1,1])
+    with top[1]:
+        st.button("⬆️ Up", use_container_width=True, on_click=turn, args=((0, -1),))
+    row = st.columns([1,1,1,2,1,1,1])
+    with row[0]:
+        st.button("⬅️ Left", use_container_width=True, on_click=turn, args=((-1, 0),))
+    with row[2]:
+        st.button("➡️ Right", use_container_width=True, on_click=turn, args=((1, 0),))
+    with row[4]:
+        st.button("⬇️ Down", use_container_width=True, on_click=turn, args=((0, 1),))
+
+    # Countdown overlay
+    if st.session_state.countdown > 0:
+        render_board()
+        st.warning(f"Starting in {st.session_state.countdown}…")
+        if not live:
+            time.sleep(COUNTDOWN_SECS)
+        st.session_state.countdown -= 1
+        if st.session_state.countdown == 0:
+            st.session_state.is_running = True
+        if not live:
+            st.rerun()
+        return
+
+    # Advance one tick; a live run triggered early by a D-pad click only redraws
+    now = time.monotonic()
+    step_ms = None
+    if not live or now - st.session_state.get("last_tick", 0.0) >= 0.75 * st.session_state.speed:
+        st.session_state.last_tick = now
+        tick = st.session_state.tick
+        t0 = time.perf_counter()
+        step()
+        if st.session_state.tick != tick:
+            step_ms = (time.perf_counter() - t0) * 1000
+        if live and step_ms is not None and st.session_state.game_over:
+            log_tick(step_ms, None, None, now)
+            st.rerun()
+
+    draw_ms, encode_ms = render_board()
+    if step_ms is not None:
+        log_tick(step_ms, draw_ms, encode_ms, now)
+    if st.session_state.show_hud:
+        with st.expander("⏱️ Performance HUD (last 200 ticks)", expanded=True):
+            perf_hud()
+
+    # Game over or keep running
+    if st.session_state.won:
+        st.success("🏆 **Board full — you win!** Press **Restart** or **Start** to play again.")
+    elif st.session_state.game_over:
+        st.error("💥 **Game Over!** Press **Restart** or **Start** to play again.")
+    elif not live:
+        time.sleep(st.session_state.speed)
+        st.rerun()
+
+if st.session_state.live_board:
+    st.session_state.live_every = tick_interval()
+    st.fragment(game_panel, run_every=st.session_state.live_every)(live=True)
 else:
-    time.sleep(st.session_state.speed)
-    st.rerun()
+    game_panel(live=False)
+
+with st.expander("⏱️ Performance log (CSV)"):
+    st.caption(f"{len(st.session_state.perf):,} ticks recorded this game (updates when the game pauses or ends).")
+    perf_buf = io.StringIO()
+    writer = csv.writer(perf_buf)
+    writer.writerow(PERF_COLUMNS)
+    writer.writerows(st.session_state.perf)
+    st.download_button("⬇️ Download timings CSV", perf_buf.getvalue().encode("utf-8"),
+                       file_name="snake_timings.csv", mime="text/csv")
+
+# -------------------- Replay viewer --------------------
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_replay(data: bytes) -> replay.Replay:
+    return replay.Replay.from_bytes(data)
+
+with st.expander("🎞️ Replay viewer"):
+    uploaded = st.file_uploader("Load a replay (.snr)", type=["snr"])
+    data = uploaded.getvalue() if uploaded else st.session_state.get("last_replay")
+    rp = None
+    if not data:
+        st.caption("Finish a game and its replay shows up here.")
+    else:
+        try:
+            rp = load_replay(data)
+        except (ValueError, struct.error):
+            st.error("Not a valid Snake replay")
+    if rp is not None:
+        st.caption(f"{rp.ticks} ticks • {len(data):,} bytes • seed {rp.seed}")
+        t = (st.slider("Tick", 0, rp.ticks, rp.ticks, key=f"replay-{rp.seed}-{rp.ticks}")
+             if rp.ticks > 0 else 0)
+        rs = rp.state_at(t)
+        st.image(draw_board(rs, reuse=False), width=rp.grid * st.session_state.cell_px)
+        st.caption(f"Score at tick {t}: {rs['score']}")
+        st.download_button("⬇️ Download replay", data, file_name=f"snake-{rp.seed}.snr",
+                           mime="application/octet-stream")
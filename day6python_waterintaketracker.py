@@ -5,6 +5,8 @@ import numpy as np
 from datetime import date, timedelta
 import altair as alt
 
+from water_store import HydrationStore, IntakeRing
+
 # ---------- Page setup ----------
 st.set_page_config(page_title="Water Intake Tracker 💧", page_icon="💧", layout="centered")
 
@@ -40,40 +42,34 @@ div.stButton > button:hover { background-color:#1E78C8; color:#FFD700 !important
 """, unsafe_allow_html=True)
 
 # ---------- State & helpers ----------
+@st.cache_resource
+def hydration_store():
+    """Saved logs for every named user, one SQLite connection per app process."""
+    return HydrationStore()
+
 def init_state():
     if "log" not in st.session_state:
-        st.session_state.log = pd.DataFrame(columns=["date", "ml"]).astype({"ml":"int"})
+        st.session_state.log = IntakeRing()   # unnamed users: this tab only
+    if "user" not in st.session_state:
+        st.session_state.user = ""
     if "goal_l" not in st.session_state:
         st.session_state.goal_l = 3.0
 
+def current_log():
+    """The signed-in user's saved log, or this session's own log if no name is set."""
+    name = st.session_state.user.strip()
+    return hydration_store().user(name) if name else st.session_state.log
+
 def add_intake(d: date, ml: int):
-    log = st.session_state.log
-    if not log.empty and d in set(pd.to_datetime(log["date"]).dt.date):
-        idx = pd.to_datetime(log["date"]).dt.date.eq(d)
-        st.session_state.log.loc[idx, "ml"] += int(ml)
-    else:
-        st.session_state.log = pd.concat(
-            [log, pd.DataFrame([{"date": pd.to_datetime(d), "ml": int(ml)}])],
-            ignore_index=True
-        )
-    st.session_state.log["date"] = pd.to_datetime(st.session_state.log["date"])
-    cutoff = date.today() - timedelta(days=60)
-    st.session_state.log = st.session_state.log[st.session_state.log["date"].dt.date >= cutoff].reset_index(drop=True)
+    current_log().add(d, int(ml))
 
 def today_total_ml() -> int:
-    if st.session_state.log.empty: return 0
-    t = date.today()
-    return int(st.session_state.log[st.session_state.log["date"].dt.date.eq(t)]["ml"].sum())
+    return current_log().today_total()
 
 def last7_df() -> pd.DataFrame:
     t = date.today()
     days = pd.date_range(t - timedelta(days=6), t, freq="D")
-    base = pd.DataFrame({"date": days})
-    if st.session_state.log.empty:
-        base["ml"] = 0
-    else:
-        daily = st.session_state.log.groupby(st.session_state.log["date"].dt.date)["ml"].sum()
-        base["ml"] = [int(daily.get(d.date(), 0)) for d in days]
+    base = pd.DataFrame({"date": days, "ml": current_log().window(7, t).astype(int)})
     base["liters"] = base["ml"] / 1000.0
     base["label"] = base["date"].dt.strftime("%a %d")
     return base
@@ -85,13 +81,14 @@ st.write("This app helps you log water, track progress to your daily goal, and v
 
 with st.sidebar:
     st.header("Settings")
+    st.text_input("👤 Your name", key="user",
+                  help="Your log is saved under this name and follows you to any device. Leave blank to keep it in this tab only.")
     st.session_state.goal_l = st.number_input("Daily goal (L)", 0.5, 10.0, float(st.session_state.goal_l), 0.5)
     if st.button("Reset today's total"):
-        if not st.session_state.log.empty:
-            st.session_state.log = st.session_state.log[st.session_state.log["date"].dt.date != date.today()].reset_index(drop=True)
+        current_log().clear_day(date.today())
         st.success("Cleared today's total.")
     if st.button("Clear all data"):
-        st.session_state.log = pd.DataFrame(columns=["date","ml"]).astype({"ml":"int"})
+        current_log().clear()
         st.success("Cleared all logs.")
 
 # Add intake
@@ -150,13 +147,15 @@ s2.metric("Daily avg", f"{w_avg:.2f} L")
 s3.metric("Goal reached", f"{days_hit}/7 days")
 
 with st.expander("View / download raw log"):
-    if st.session_state.log.empty:
+    log = current_log()
+    if log.empty():
         st.write("No entries yet.")
     else:
-        show_df = st.session_state.log.copy()
+        log_df = log.to_frame()
+        show_df = log_df.copy()
         show_df["date"] = show_df["date"].dt.date
         st.dataframe(show_df.sort_values("date", ascending=False), use_container_width=True)
-        csv_df = st.session_state.log.copy()
+        csv_df = log_df
         csv_df["date"] = csv_df["date"].dt.strftime("%Y-%m-%d")
         st.download_button("⬇️ Download CSV", csv_df.to_csv(index=False).encode("utf-8"),
                            file_name="water_log.csv", mime="text/csv")
@@ -0,0 +1,82 @@
+# rps_benchmark.py
+# Plays the adaptive RPS opponent against scripted player bots.
+# Reports how often it predicts the bot's move, its win rate and per-move latency.
+# Run: python rps_benchmark.py --rounds 10000 --order 3
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, Dict
+
+import rps_engine as engine
+from rps_engine import BEATS, PAPER, ROCK, SCISSORS
+
+# A bot picks its move from (its last move, the computer's last move, round index, rng);
+# the last moves are None on the first round.
+Bot = Callable[[int, int, int, random.Random], int]
+
+
+def _win_stay_lose_shift(me, them, n, rng):
+    if me is None:
+        return rng.randrange(3)
+    return me if BEATS[them] == me else BEATS[me]
+
+
+BOTS: Dict[str, Bot] = {
+    "constant": lambda me, them, n, rng: ROCK,
+    "cycle": lambda me, them, n, rng: n % 3,
+    "pattern": lambda me, them, n, rng: (ROCK, ROCK, PAPER, SCISSORS)[n % 4],
+    "biased": lambda me, them, n, rng: rng.choices((ROCK, PAPER, SCISSORS), (5, 3, 2))[0],
+    "copy": lambda me, them, n, rng: rng.randrange(3) if them is None else them,
+    "beat-last": lambda me, them, n, rng: rng.randrange(3) if them is None else BEATS[them],
+    "win-stay": _win_stay_lose_shift,
+    "random": lambda me, them, n, rng: rng.randrange(3),
+}
+
+
+def play(bot: Bot, rounds: int, order: int, seed: int):
+    """(correct predictions, computer wins, draws, per-move seconds) for one match."""
+    rng = random.Random(seed)
+    model = engine.MarkovPredictor(order)
+    correct = wins = draws = 0
+    times = []
+    me = them = None
+    for n in range(rounds):
+        move = bot(me, them, n, rng)
+        t0 = time.perf_counter()
+        guess = model.predict(rng)
+        comp = rng.randrange(3) if guess is None else BEATS[guess]
+        model.update(move)
+        times.append(time.perf_counter() - t0)
+        correct += guess == move
+        wins += comp == BEATS[move]
+        draws += comp == move
+        me, them = move, comp
+    return correct, wins, draws, times, model.nbytes
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the adaptive RPS opponent against scripted bots.")
+    ap.add_argument("--rounds", type=int, default=10_000, help="rounds per bot")
+    ap.add_argument("--order", type=int, default=3, help="longest context the model uses")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    print(f"{'bot':<10} {'predicted':>9} {'cpu win':>8} {'draw':>6} {'cpu loss':>8}   µs/move mean    p99")
+    all_times = []
+    for name, bot in BOTS.items():
+        correct, wins, draws, times, nbytes = play(bot, args.rounds, args.order, args.seed)
+        us = sorted(t * 1e6 for t in times)
+        all_times.extend(us)
+        pct = lambda k: f"{k * 100 / args.rounds:.1f}%"
+        print(f"{name:<10} {pct(correct):>9} {pct(wins):>8} {pct(draws):>6} "
+              f"{pct(args.rounds - wins - draws):>8}   {statistics.mean(us):12.2f} {us[int(len(us) * 0.99)]:6.2f}")
+    all_times.sort()
+    print()
+    print(f"order {args.order}, {args.rounds:,} rounds per bot, model size {nbytes} bytes")
+    print(f"predict+update µs/move: mean {statistics.mean(all_times):.2f}  "
+          f"p99 {all_times[int(len(all_times) * 0.99)]:.2f}  max {all_times[-1]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
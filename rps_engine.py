@@ -0,0 +1,176 @@
+# rps_engine.py
+# Rock-Paper-Scissors rules and computer opponents for day13python_rockpaperscissors.py.
+#
+# Moves are small ints (0 Rock, 1 Paper, 2 Scissors) so every lookup is an
+# index; names and emoji are only attached by the UI.
+import random
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MOVES = ("Rock", "Paper", "Scissors")
+ROCK, PAPER, SCISSORS = range(3)
+BEATS = (PAPER, SCISSORS, ROCK)   # BEATS[m] is the move that beats m
+
+# OUTCOME[user][computer]: 1 user wins, 0 draw, -1 computer wins
+DRAW, USER_WINS, COMP_WINS = 0, 1, -1
+OUTCOME: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(DRAW if u == c else (USER_WINS if BEATS[c] == u else COMP_WINS) for c in range(3))
+    for u in range(3)
+)
+OUTCOME_MATRIX = np.array(OUTCOME, dtype=np.int8)
+
+
+# -------------------- Adaptive opponent --------------------
+class MarkovPredictor:
+    """Order-0..k n-gram model of one player's moves.
+
+    counts[k] holds, for each of the 3**k contexts (the player's last k moves),
+    how often each move followed it. update() touches one row per order, so a
+    round costs O(k) regardless of history length. Counts are bytes and a row
+    is halved when one of them reaches `cap`, so the model stays a fixed few
+    hundred bytes for a whole session and old habits fade out.
+    """
+
+    def __init__(self, order: int = 3, cap: int = 255):
+        self.order, self.cap = order, min(cap, 255)
+        self.pow3 = tuple(3 ** k for k in range(order + 1))
+        self.counts: List[bytearray] = [bytearray(3 * p) for p in self.pow3]
+        self.context = 0   # last `order` moves in base 3, most recent lowest
+        self.seen = 0      # moves observed so far, capped at `order`
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(c) for c in self.counts)
+
+    def update(self, move: int):
+        """Record the player's `move` under every context order seen so far."""
+        for k in range(self.seen + 1):
+            row = self.context % self.pow3[k] * 3
+            c = self.counts[k]
+            if c[row + move] >= self.cap:
+                for j in range(row, row + 3):
+                    c[j] >>= 1
+            c[row + move] += 1
+        self.context = (self.context * 3 + move) % self.pow3[self.order]
+        self.seen = min(self.seen + 1, self.order)
+
+    def predict(self, rng=random) -> Optional[int]:
+        """Most likely next move from the longest context with data, or None before any."""
+        for k in range(self.seen, -1, -1):
+            row = self.context % self.pow3[k] * 3
+            r = self.counts[k][row:row + 3]
+            best = max(r)
+            if best:
+                top = [m for m in range(3) if r[m] == best]
+                return top[0] if len(top) == 1 else rng.choice(top)
+        return None
+
+    def move_mix(self) -> Tuple[float, float, float]:
+        """Smoothed share of Rock/Paper/Scissors among the moves seen so far."""
+        c = self.counts[0]
+        total = sum(c) + 3
+        return tuple((c[m] + 1) / total for m in range(3))
+
+
+def adaptive_move(model: MarkovPredictor, rng=random) -> int:
+    """Counter the model's prediction; random until it has seen a move."""
+    p = model.predict(rng)
+    return rng.randrange(3) if p is None else BEATS[p]
+
+
+# -------------------- Batch Monte Carlo --------------------
+# A batch strategy fills an (n, rounds) int8 array of moves in one call.
+BatchStrategy = Callable[[int, int, np.random.Generator], np.ndarray]
+
+
+def mixed(weights: Sequence[float]) -> BatchStrategy:
+    """Independent moves each round, Rock/Paper/Scissors in proportion to `weights`."""
+    cdf = np.cumsum(np.asarray(weights, dtype=np.float64))
+    cdf = (cdf[:2] / cdf[-1]).astype(np.float32)
+
+    def moves(n: int, rounds: int, rng: np.random.Generator) -> np.ndarray:
+        return np.searchsorted(cdf, rng.random((n, rounds), dtype=np.float32), side="right").astype(np.int8)
+    return moves
+
+
+def cycle(n: int, rounds: int, rng: np.random.Generator) -> np.ndarray:
+    """Rock, Paper, Scissors, ... from a random starting move per tournament."""
+    start = rng.integers(0, 3, size=(n, 1), dtype=np.int8)
+    return (start + np.arange(rounds, dtype=np.int8)) % 3
+
+
+BATCH_STRATEGIES: Dict[str, BatchStrategy] = {
+    "random": mixed((1, 1, 1)),
+    "rock-heavy": mixed((2, 1, 1)),
+    "cycle": cycle,
+}
+
+
+def simulate(n: int, rounds: int, user: BatchStrategy, comp: BatchStrategy,
+             seed: Optional[int] = None, start: Tuple[int, int] = (0, 0)) -> Dict:
+    """Play `n` tournaments of `rounds` rounds in one vectorized pass.
+
+    `start` is the (user, computer) score already on the board, so the same
+    call answers "who wins from here" mid-tournament. Returns the final
+    user_score / comp_score distributions (index = score) and the champion
+    probabilities.
+    """
+    rng = np.random.default_rng(seed)
+    u, c = user(n, rounds, rng), comp(n, rounds, rng)
+    out = OUTCOME_MATRIX.ravel()[u.astype(np.intp) * 3 + c]
+    user_score = np.count_nonzero(out == USER_WINS, axis=1) + start[0]
+    comp_score = np.count_nonzero(out == COMP_WINS, axis=1) + start[1]
+    top = rounds + max(start)
+    lead = np.sign(user_score - comp_score)
+    return {
+        "tournaments": n,
+        "user_score": np.bincount(user_score, minlength=top + 1) / n,
+        "comp_score": np.bincount(comp_score, minlength=top + 1) / n,
+        "champion": {
+            "user": float(np.count_nonzero(lead > 0)) / n,
+            "comp": float(np.count_nonzero(lead < 0)) / n,
+            "draw": float(np.count_nonzero(lead == 0)) / n,
+        },
+    }
+
+
+# -------------------- Round history --------------------
+class RoundLog:
+    """Last `capacity` rounds in a ring of bytes (user | computer << 2), with running totals.
+
+    Appending is O(1) and the totals cover every round played, including ones
+    that have rotated out of the ring, so a scoreboard never rescans history.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.buf = bytearray(capacity)
+        self.total = 0
+        self.user_wins = self.comp_wins = self.draws = 0
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def append(self, user: int, comp: int) -> int:
+        """Record a round; returns its OUTCOME."""
+        self.buf[self.total % self.capacity] = user | comp << 2
+        self.total += 1
+        outcome = OUTCOME[user][comp]
+        if outcome == USER_WINS:
+            self.user_wins += 1
+        elif outcome == COMP_WINS:
+            self.comp_wins += 1
+        else:
+            self.draws += 1
+        return outcome
+
+    def latest(self, skip: int = 0, count: int = 10) -> List[Tuple[int, int, int, int]]:
+        """Up to `count` kept rounds newest-first after skipping `skip`: (round no, user, computer, outcome)."""
+        rows = []
+        for back in range(skip, min(skip + count, len(self))):
+            n = self.total - 1 - back
+            b = self.buf[n % self.capacity]
+            user, comp = b & 3, b >> 2
+            rows.append((n + 1, user, comp, OUTCOME[user][comp]))
+        return rows
@@ -0,0 +1,186 @@
+# snake_autopilot.py
+# Autopilot for Snake: BFS to the food, but only along paths that leave the
+# tail reachable afterwards; otherwise stall away from the tail until a safe
+# path opens.
+#
+# Works on the same state mapping as snake_engine (a dict or st.session_state)
+# and steers through engine.turn(), so it obeys the normal no-reverse rule.
+# A safe food path stays safe while it is followed (only the head enters its
+# cells), so it is kept in s["autopilot_path"] and the search runs once per food.
+# Every search looks at a per-move deadline on its first cell and then every
+# 256 cells; once it has passed, the search is abandoned and the planner takes
+# the cheapest safe move. A call's own work therefore overruns BUDGET_MS by at
+# most one check interval plus the O(length) snake copies between searches.
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+import snake_engine as engine
+from snake_engine import Cell, CellId, State
+
+Adjacency = Tuple[Tuple[CellId, ...], ...]
+
+BUDGET_MS = 5.0     # planner time per move before falling back to the cheapest safe move
+_CHECK_MASK = 255   # searches look at the clock every 256 cells (mask + 1)
+
+
+class _OutOfTime(Exception):
+    """A search ran past the move's deadline."""
+
+
+@lru_cache(maxsize=None)
+def adjacency(grid: int) -> Adjacency:
+    """For every cell id, the ids of its in-bounds neighbours."""
+    table = []
+    for i in range(grid * grid):
+        y, x = divmod(i, grid)
+        table.append(tuple((y + dy) * grid + (x + dx)
+                           for dx, dy in engine.DIRS
+                           if 0 <= x + dx < grid and 0 <= y + dy < grid))
+    return tuple(table)
+
+
+def bfs(adj: Adjacency, start: CellId, goal: CellId, blocked,
+        deadline: Optional[float] = None) -> Optional[List[CellId]]:
+    """Shortest path start→goal (start excluded) avoiding `blocked`; the goal itself may be blocked."""
+    prev = [-1] * len(adj)
+    prev[start] = start
+    q = deque([start])
+    visited = 0
+    while q:
+        c = q.popleft()
+        if not visited & _CHECK_MASK and deadline is not None and time.perf_counter() > deadline:
+            raise _OutOfTime
+        visited += 1
+        for n in adj[c]:
+            if prev[n] < 0 and (n == goal or n not in blocked):
+                prev[n] = c
+                if n == goal:
+                    path = [n]
+                    while prev[path[-1]] != start:
+                        path.append(prev[path[-1]])
+                    path.reverse()
+                    return path
+                q.append(n)
+    return None
+
+
+def distances(adj: Adjacency, start: CellId, blocked, deadline: Optional[float] = None) -> List[int]:
+    """BFS distance from `start` to every cell (-1 where unreachable or blocked)."""
+    dist = [-1] * len(adj)
+    dist[start] = 0
+    q = deque([start])
+    visited = 0
+    while q:
+        c = q.popleft()
+        if not visited & _CHECK_MASK and deadline is not None and time.perf_counter() > deadline:
+            raise _OutOfTime
+        visited += 1
+        dc = dist[c] + 1
+        for n in adj[c]:
+            if dist[n] < 0 and n not in blocked:
+                dist[n] = dc
+                q.append(n)
+    return dist
+
+
+def region_sizes(adj: Adjacency, starts: List[CellId], blocked, deadline: Optional[float] = None) -> List[int]:
+    """Open cells reachable from each start, from one flood fill shared by all starts."""
+    region = [-1] * len(adj)   # index into `sizes` of the region each cell was filled from
+    sizes, out = [], []
+    visited = 0
+    for start in starts:
+        if region[start] < 0:
+            r = len(sizes)
+            region[start] = r
+            q, size = deque([start]), 0
+            while q:
+                c = q.popleft()
+                size += 1
+                if not visited & _CHECK_MASK and deadline is not None and time.perf_counter() > deadline:
+                    raise _OutOfTime
+                visited += 1
+                for n in adj[c]:
+                    if region[n] < 0 and n not in blocked:
+                        region[n] = r
+                        q.append(n)
+            sizes.append(size)
+        out.append(sizes[region[start]])
+    return out
+
+
+def _advance(snake: deque, path: Iterable[CellId], food: Optional[CellId]) -> deque:
+    """Copy of `snake` after walking `path` (growing when it passes the food)."""
+    body = deque(snake)
+    for c in path:
+        body.appendleft(c)
+        if c != food:
+            body.pop()
+    return body
+
+
+def _dir_to(grid: int, frm: CellId, to: CellId) -> Cell:
+    (fy, fx), (ty, tx) = divmod(frm, grid), divmod(to, grid)
+    return (tx - fx, ty - fy)
+
+
+def _fallback(g: int, adj: Adjacency, head: CellId, safe: List[CellId], body) -> Optional[Cell]:
+    """Out of time: the safe move with the most open neighbours, no search."""
+    if not safe:
+        return None
+    return _dir_to(g, head, max(safe, key=lambda n: sum(m not in body for m in adj[n])))
+
+
+def plan(s: State, budget_ms: float = BUDGET_MS) -> Optional[Cell]:
+    """Direction for the next tick, or None when every move is fatal."""
+    snake, food = s["snake"], s["food"]
+    if food is None or s["game_over"]:
+        return None
+    g = s["grid"]
+    adj = adjacency(g)
+    head, tail = snake[0], snake[-1]
+
+    # 0) keep following the safe path planned for this food
+    target, path = s.get("autopilot_path") or (None, None)
+    if target == food and path and path[0] in adj[head]:
+        return _dir_to(g, head, path.popleft())
+    s["autopilot_path"] = None
+
+    deadline = time.perf_counter() + budget_ms / 1000
+    body = set(snake)
+    safe = [n for n in adj[head] if n not in body or (n == tail != food)]
+    try:
+        # 1) shortest path to food, accepted only if the tail is still reachable there
+        path = bfs(adj, head, food, body, deadline)
+        if path is not None:
+            after = _advance(snake, path, food)
+            if len(after) == g * g or bfs(adj, after[0], after[-1], set(after), deadline) is not None:
+                s["autopilot_path"] = (food, deque(path[1:]))
+                return _dir_to(g, head, path[0])
+
+        # 2) otherwise stall: one BFS out from where the tail will be next tick, then
+        #    take the safe move farthest from it so the body uncoils until a safe
+        #    food path appears
+        body.discard(tail)   # from here on: cells still occupied next tick
+        dist = distances(adj, snake[-2], body, deadline)
+        reachable = [n for n in safe if dist[n] >= 0]
+        if reachable:
+            return _dir_to(g, head, max(reachable, key=dist.__getitem__))
+
+        # 3) no way back to the tail: pick the move with the most room left
+        if safe:
+            room = dict(zip(safe, region_sizes(adj, safe, body, deadline)))
+            return _dir_to(g, head, max(safe, key=room.__getitem__))
+        return None
+    except _OutOfTime:
+        body.discard(tail)
+        return _fallback(g, adj, head, safe, body)
+
+
+def steer(s: State, budget_ms: float = BUDGET_MS) -> Optional[Cell]:
+    """Plan and queue the next move through engine.turn(); returns the chosen direction."""
+    d = plan(s, budget_ms)
+    if d is not None:
+        engine.turn(s, d)
+    return d
@@ -0,0 +1,71 @@
+# snake_benchmark.py
+# Headless soak test: the autopilot plays many seeded games through snake_engine.
+# Run: python snake_benchmark.py --games 20 --grid 22
+#      python snake_benchmark.py --games 3 --grid 64 --budget-ms 20
+import argparse
+import statistics
+import time
+
+import snake_autopilot as autopilot
+import snake_engine as engine
+
+
+def play(seed: int, grid: int, max_steps: int, plan_budget_ms: float = autopilot.BUDGET_MS):
+    """One autopilot game; returns (score, won, steps, per-move planner seconds).
+
+    A game also stops once the snake has gone `max_steps` ticks without eating,
+    which is how a tail-chasing autopilot that can no longer reach food ends.
+    """
+    s = {}
+    engine.init_game(s, grid=grid, seed=seed)
+    plan_times = []
+    last_meal, last_score = 0, 0
+    while not s["game_over"] and s["tick"] - last_meal < max_steps:
+        t0 = time.perf_counter()
+        autopilot.steer(s, plan_budget_ms)
+        plan_times.append(time.perf_counter() - t0)
+        engine.step(s)
+        if s["score"] != last_score:
+            last_meal, last_score = s["tick"], s["score"]
+    return s["score"], s["won"], s["tick"], plan_times
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the Snake autopilot on the headless engine.")
+    ap.add_argument("--games", type=int, default=20, help="number of seeds to play")
+    ap.add_argument("--grid", type=int, default=engine.DEFAULT_GRID)
+    ap.add_argument("--max-steps", type=int, default=0, help="ticks without food before a game is called (default 2×cells)")
+    ap.add_argument("--budget-ms", type=float, default=10.0, help="planner time budget per tick")
+    ap.add_argument("--plan-budget-ms", type=float, default=autopilot.BUDGET_MS,
+                    help="deadline the planner itself stops searching at (keep below --budget-ms)")
+    ap.add_argument("--seed", type=int, default=0, help="first seed")
+    args = ap.parse_args()
+    max_steps = args.max_steps or 2 * args.grid * args.grid
+
+    scores, wins, steps, plan_times = [], 0, 0, []
+    t0 = time.perf_counter()
+    for seed in range(args.seed, args.seed + args.games):
+        score, won, n, times = play(seed, args.grid, max_steps, args.plan_budget_ms)
+        scores.append(score)
+        wins += won
+        steps += n
+        plan_times.extend(times)
+        print(f"seed {seed:>4}: score {score:>5}  steps {n:>7}  {'WIN' if won else ''}")
+    wall = time.perf_counter() - t0
+
+    plan_ms = sorted(t * 1000 for t in plan_times)
+    over = sum(1 for t in plan_ms if t > args.budget_ms)
+    p99 = plan_ms[min(len(plan_ms) - 1, int(len(plan_ms) * 0.99))] if plan_ms else 0.0
+    print()
+    print(f"grid {args.grid}×{args.grid}, {args.games} games, {steps:,} steps in {wall:.2f}s")
+    print(f"average score   : {statistics.mean(scores):.1f} (max {max(scores)}, wins {wins})")
+    print(f"steps per second: {steps / wall:,.0f}")
+    if plan_ms:
+        print(f"planner ms/move : mean {statistics.mean(plan_ms):.3f}  p99 {p99:.3f}  max {plan_ms[-1]:.3f}")
+        print(f"over {args.budget_ms:g} ms budget: {over} of {len(plan_ms):,} moves ({over * 100 / len(plan_ms):.2f}%)")
+        print(f"(planner searches stop at {args.plan_budget_ms:g} ms; moves over budget beyond that are "
+              f"time the process spent descheduled or in GC)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# snake_engine.py
+# Headless Snake rules shared by the Streamlit app, the autopilot and batch runs.
+#
+# Single games keep their state in any mutable mapping (a plain dict, or
+# st.session_state in the app), so the rules never import Streamlit.
+# BatchSnake advances thousands of independent games at once with NumPy.
+import random
+from array import array
+from collections import deque
+from typing import Deque, MutableMapping, Optional, Tuple
+
+import numpy as np
+
+Cell = Tuple[int, int]   # (x, y) on screen
+CellId = int             # packed cell: y*grid + x
+State = MutableMapping
+
+DEFAULT_GRID = 22
+DIRS: Tuple[Cell, ...] = ((0, -1), (1, 0), (0, 1), (-1, 0))   # up, right, down, left
+
+
+# -------------------- State --------------------
+def init_game(s: State, grid: int = DEFAULT_GRID, seed: Optional[int] = None):
+    """Reset `s` to a fresh game: 3-long snake centered, facing right, food placed."""
+    g = grid
+    s["grid"] = g
+    s["seed"] = seed if seed is not None else random.randrange(2**32)
+    s["rng"] = random.Random(s["seed"])
+    # head at the left end of the deque
+    s["snake"] = deque((g//2) * g + g//2 + i for i in range(0, -3, -1))
+    build_occupancy(s)
+    s["dir"] = (1, 0)
+    s["pending_dir"] = (1, 0)
+    s["food"] = spawn_food(s)
+    s["score"] = 0
+    s["tick"] = 0
+    s["game_over"] = False
+    s["won"] = False        # snake filled the whole board
+
+
+# -------------------- Occupancy index --------------------
+# The snake and food are stored as packed cell ids (y*grid + x). Free ids live in a
+# dense int array; free_pos[id] is the id's slot in that array, or -1 while the
+# snake occupies the cell. Occupying swaps the last free id into the vacated slot,
+# so all updates are O(1), and both arrays pickle as flat machine ints.
+def build_occupancy(s: State):
+    n = s["grid"] ** 2
+    s["free"] = array("i", range(n))
+    s["free_pos"] = array("i", range(n))
+    for i in s["snake"]:
+        occupy(s, i)
+
+def occupy(s: State, i: CellId):
+    free, pos = s["free"], s["free_pos"]
+    k = pos[i]
+    last = free.pop()
+    if last != i:
+        free[k] = last
+        pos[last] = k
+    pos[i] = -1
+
+def release(s: State, i: CellId):
+    free = s["free"]
+    s["free_pos"][i] = len(free)
+    free.append(i)
+
+def is_occupied(s: State, i: CellId) -> bool:
+    return s["free_pos"][i] < 0
+
+def spawn_food(s: State) -> Optional[CellId]:
+    free = s["free"]
+    if not free:
+        return None  # board full
+    return s["rng"].choice(free)
+
+
+# -------------------- Controls --------------------
+def valid_turn(s: State, new_dir: Cell) -> bool:
+    cx, cy = s["dir"]
+    nx, ny = new_dir
+    return (nx, ny) != (-cx, -cy)
+
+def turn(s: State, new_dir: Cell):
+    if valid_turn(s, new_dir):
+        s["pending_dir"] = new_dir
+
+
+# -------------------- Game step (with correct tail rule) --------------------
+def step(s: State):
+    """Advance one tick. Sets game_over (and won) instead of raising."""
+    if s["game_over"]:
+        return
+
+    g = s["grid"]
+    snake: Deque[CellId] = s["snake"]
+
+    # apply direction chosen this tick
+    s["dir"] = s["pending_dir"]
+    dx, dy = s["dir"]
+    hy, hx = divmod(snake[0], g)
+    nx, ny = hx + dx, hy + dy
+    s["tick"] += 1
+
+    # wall collision
+    if not (0 <= nx < g and 0 <= ny < g):
+        s["game_over"] = True
+        return
+
+    new_head = ny * g + nx
+    will_grow = (new_head == s["food"])
+
+    # self collision (allow stepping onto tail if it will move this tick)
+    if is_occupied(s, new_head) and (will_grow or new_head != snake[-1]):
+        s["game_over"] = True
+        return
+
+    # move snake (free the tail first so the head may take its cell)
+    if not will_grow:
+        release(s, snake.pop())
+    snake.appendleft(new_head)
+    occupy(s, new_head)
+    if will_grow:
+        s["score"] += 1
+        s["food"] = spawn_food(s)
+        if s["food"] is None:
+            s["won"] = True
+            s["game_over"] = True
+
+
+# -------------------- Batched games --------------------
+class BatchSnake:
+    """Many independent games stepped together with NumPy.
+
+    Bodies are not stored as lists. Each cell remembers the tick at which a head
+    entered it (`stamp`), and a cell is occupied while
+    ``stamp > t - length``. Moving the tail or growing only changes `t` and
+    `length`, so one step is a handful of array operations for every game at once.
+    The tail rule matches `step()`: the head may enter the current tail cell
+    unless the snake grows this tick.
+    """
+
+    EMPTY = np.iinfo(np.int32).min // 2
+
+    def __init__(self, n_games: int, grid: int = DEFAULT_GRID, seed: Optional[int] = None):
+        self.n, self.g = n_games, grid
+        self.rng = np.random.default_rng(seed)
+        self.dx = np.array([d[0] for d in DIRS], dtype=np.int32)
+        self.dy = np.array([d[1] for d in DIRS], dtype=np.int32)
+        self.stamp = np.empty((n_games, grid * grid), dtype=np.int32)
+        self.head = np.empty(n_games, dtype=np.int32)
+        self.dir = np.empty(n_games, dtype=np.int8)
+        self.food = np.empty(n_games, dtype=np.int32)
+        self.length = np.empty(n_games, dtype=np.int32)
+        self.t = np.empty(n_games, dtype=np.int32)
+        self.score = np.empty(n_games, dtype=np.int32)
+        self.alive = np.empty(n_games, dtype=bool)
+        self.won = np.empty(n_games, dtype=bool)
+        self.steps = 0   # total game-steps advanced, for throughput numbers
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None):
+        """Restart the games selected by `mask` (all games by default)."""
+        idx = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        if idx.size == 0:
+            return
+        g = self.g
+        c = (g//2) * g + g//2
+        self.stamp[idx] = self.EMPTY
+        self.stamp[idx, c] = 2
+        self.stamp[idx, c - 1] = 1
+        self.stamp[idx, c - 2] = 0
+        self.head[idx] = c
+        self.dir[idx] = 1   # right
+        self.length[idx] = 3
+        self.t[idx] = 2
+        self.score[idx] = 0
+        self.alive[idx] = True
+        self.won[idx] = False
+        self._spawn_food(idx)
+
+    def occupied(self) -> np.ndarray:
+        """(n_games, grid*grid) boolean occupancy grids."""
+        return self.stamp > (self.t - self.length)[:, None]
+
+    def body(self, i: int) -> Deque[CellId]:
+        """Snake `i` as a head-first deque of cell ids, like the single-game state."""
+        cells = np.flatnonzero(self.stamp[i] > self.t[i] - self.length[i])
+        return deque(cells[np.argsort(-self.stamp[i, cells])].tolist())
+
+    def _spawn_food(self, idx: np.ndarray):
+        free = self.stamp[idx] <= (self.t[idx] - self.length[idx])[:, None]
+        full = ~free.any(axis=1)
+        keys = np.where(free, self.rng.random(free.shape), -1.0)
+        self.food[idx] = keys.argmax(axis=1)
+        if full.any():
+            done = idx[full]
+            self.food[done] = -1
+            self.won[done] = True
+            self.alive[done] = False
+
+    def step(self, actions: Optional[np.ndarray] = None):
+        """Advance every live game one tick.
+
+        `actions` holds a DIRS index per game, or -1 to keep going straight;
+        reversing onto the neck is ignored, as with `turn()`.
+        """
+        idx = np.flatnonzero(self.alive)
+        if idx.size == 0:
+            return
+        g = self.g
+        d = self.dir[idx]
+        if actions is not None:
+            a = np.asarray(actions)[idx]
+            ok = (a >= 0) & (a != (d + 2) % 4)
+            d = np.where(ok, a, d).astype(np.int8)
+            self.dir[idx] = d
+
+        hy, hx = np.divmod(self.head[idx], g)
+        nx, ny = hx + self.dx[d], hy + self.dy[d]
+        wall = (nx < 0) | (nx >= g) | (ny < 0) | (ny >= g)
+        new_head = np.where(wall, 0, ny * g + nx)
+
+        t1 = self.t[idx] + 1
+        grow = new_head == self.food[idx]
+        new_len = self.length[idx] + grow
+        hit_self = self.stamp[idx, new_head] > t1 - new_len
+        dead = wall | hit_self
+        self.steps += idx.size
+
+        self.alive[idx[dead]] = False
+        keep = ~dead
+        mv, nh = idx[keep], new_head[keep]
+        self.stamp[mv, nh] = t1[keep]
+        self.head[mv] = nh
+        self.t[mv] = t1[keep]
+        self.length[mv] = new_len[keep]
+        ate = mv[grow[keep]]
+        if ate.size:
+            self.score[ate] += 1
+            self._spawn_food(ate)
+
+
+if __name__ == "__main__":
+    import time
+
+    games, ticks = 4096, 500
+    batch = BatchSnake(games, seed=0)
+    actions = np.empty(games, dtype=np.int8)
+    rng = np.random.default_rng(1)
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        actions[:] = np.where(rng.random(games) < 0.2, rng.integers(0, 4, games), -1)
+        batch.step(actions)
+        batch.reset(~batch.alive)
+    dt = time.perf_counter() - t0
+    print(f"{batch.steps:,} game-steps in {dt:.2f}s → {batch.steps / dt:,.0f} steps/s")
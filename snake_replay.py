@@ -0,0 +1,134 @@
+# snake_replay.py
+# Compact Snake replays: RNG seed + grid + a packed stream of direction changes.
+#
+# Food placement is driven by the game's seeded RNG, so a game is fully
+# reproducible from its seed and the ticks at which the direction changed.
+# Each change is one varint of (ticks since previous change << 2 | DIRS index),
+# which keeps long games in the low kilobytes. Playback re-simulates with
+# snake_engine from periodic keyframes, so seeking never replays the whole game.
+import random
+import struct
+import threading
+from array import array
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, List, Tuple
+
+import snake_engine as engine
+from snake_engine import State
+
+MAGIC = b"SNR1"
+HEADER = struct.Struct("<4sHII")   # magic, grid, seed, ticks
+KEYFRAME_EVERY = 128               # ticks between playback snapshots
+MIN_GRID, MAX_GRID = 4, 256        # board sizes accepted from a replay file
+START_DIR = engine.DIRS.index((1, 0))
+
+
+def _put_varint(buf: bytearray, n: int):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _get_varints(data: bytes, pos: int):
+    n = shift = 0
+    for b in data[pos:]:
+        n |= (b & 0x7F) << shift
+        if b & 0x80:
+            shift += 7
+        else:
+            yield n
+            n = shift = 0
+
+
+class ReplayRecorder:
+    """Collects direction changes while a game runs; call record() after every step."""
+
+    def __init__(self, grid: int, seed: int):
+        self.grid, self.seed = grid, seed
+        self.ticks = 0
+        self.last_tick, self.last_dir = 0, START_DIR
+        self.stream = bytearray()
+
+    def record(self, s: State):
+        d = engine.DIRS.index(s["dir"])
+        if d != self.last_dir:
+            _put_varint(self.stream, (s["tick"] - self.last_tick) << 2 | d)
+            self.last_tick, self.last_dir = s["tick"], d
+        self.ticks = s["tick"]
+
+    def to_bytes(self) -> bytes:
+        return HEADER.pack(MAGIC, self.grid, self.seed, self.ticks) + bytes(self.stream)
+
+
+def _snapshot(s: State) -> dict:
+    snap = {k: v for k, v in s.items() if k not in ("snake", "free", "free_pos", "rng")}
+    snap["snake"] = deque(s["snake"])
+    snap["free"] = array("i", s["free"])
+    snap["free_pos"] = array("i", s["free_pos"])
+    snap["rng_state"] = s["rng"].getstate()
+    return snap
+
+
+def _restore(snap: dict) -> State:
+    s = dict(snap)
+    s["snake"] = deque(snap["snake"])
+    s["free"] = array("i", snap["free"])
+    s["free_pos"] = array("i", snap["free_pos"])
+    s["rng"] = random.Random()
+    s["rng"].setstate(s.pop("rng_state"))
+    return s
+
+
+class Replay:
+    """A decoded replay that can jump to any tick."""
+
+    def __init__(self, grid: int, seed: int, ticks: int, changes: List[Tuple[int, int]]):
+        self.grid, self.seed, self.ticks = grid, seed, ticks
+        self.change_ticks = [t for t, _ in changes]
+        self.change_dirs = [d for _, d in changes]
+        start: Dict = {}
+        engine.init_game(start, grid=grid, seed=seed)
+        self.keyframes = [_snapshot(start)]   # keyframes[i] is the state at tick i*KEYFRAME_EVERY
+        self._lock = threading.Lock()         # replays are shared across sessions via st.cache_resource
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        """Decode a replay; raises ValueError for anything that is not a playable one."""
+        if len(data) < HEADER.size:
+            raise ValueError("replay is shorter than its header")
+        magic, grid, seed, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a Snake replay")
+        if not MIN_GRID <= grid <= MAX_GRID:
+            raise ValueError(f"grid {grid} is outside {MIN_GRID}..{MAX_GRID}")
+        changes, t = [], 0
+        for v in _get_varints(data, HEADER.size):
+            t += v >> 2
+            changes.append((t, v & 3))
+        return cls(grid, seed, ticks, changes)
+
+    def dir_at(self, tick: int):
+        """Direction applied on the step that reaches `tick`."""
+        i = bisect_right(self.change_ticks, tick) - 1
+        return engine.DIRS[self.change_dirs[i] if i >= 0 else START_DIR]
+
+    def _advance(self, s: State, to_tick: int):
+        while s["tick"] < to_tick and not s["game_over"]:
+            s["pending_dir"] = self.dir_at(s["tick"] + 1)
+            engine.step(s)
+
+    def state_at(self, tick: int) -> State:
+        """Fresh game state at `tick` (clamped to the recorded length)."""
+        tick = max(0, min(tick, self.ticks))
+        k = tick // KEYFRAME_EVERY
+        with self._lock:
+            while len(self.keyframes) <= k:
+                s = _restore(self.keyframes[-1])
+                self._advance(s, len(self.keyframes) * KEYFRAME_EVERY)
+                self.keyframes.append(_snapshot(s))
+            key = self.keyframes[k]
+        s = _restore(key)
+        self._advance(s, tick)
+        return s
@@ -0,0 +1,250 @@
+# tictactoe_engine.py
+# Bitboard Tic-Tac-Toe engine used by day12python_tictactoe.py.
+#
+# A position is two 9-bit ints, one per player; bit i (= r*3 + c) is set when
+# that player owns the cell. Every lookup below is precomputed for all 512
+# masks, so win / draw / move generation are table reads and integer ops.
+import csv
+import io
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+X, O, EMPTY = "X", "O", ""
+FULL = (1 << 9) - 1
+
+# Same order as the old lines(): rows, columns, then the two diagonals.
+WIN_LINES: Tuple[Tuple[Tuple[int, int], ...], ...] = (
+    tuple(tuple((r, c) for c in range(3)) for r in range(3))
+    + tuple(tuple((r, c) for r in range(3)) for c in range(3))
+    + (((0, 0), (1, 1), (2, 2)), ((0, 2), (1, 1), (2, 0)))
+)
+WIN_MASKS: Tuple[int, ...] = tuple(sum(1 << (r*3 + c) for r, c in line) for line in WIN_LINES)
+
+# WIN_LINE_OF[bits] -> index of the first completed line in `bits`, or -1
+WIN_LINE_OF: Tuple[int, ...] = tuple(
+    next((k for k, m in enumerate(WIN_MASKS) if b & m == m), -1) for b in range(1 << 9)
+)
+# MOVES[occupied] -> empty cell indices, in board order
+MOVES: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(i for i in range(9) if not occ >> i & 1) for occ in range(1 << 9)
+)
+POPCOUNT: Tuple[int, ...] = tuple(bin(b).count("1") for b in range(1 << 9))
+
+
+def winner(xb: int, ob: int) -> Tuple[Optional[str], int]:
+    """(winning symbol, WIN_LINES index) or (None, -1)."""
+    k = WIN_LINE_OF[xb]
+    if k >= 0:
+        return X, k
+    k = WIN_LINE_OF[ob]
+    if k >= 0:
+        return O, k
+    return None, -1
+
+
+def is_full(xb: int, ob: int) -> bool:
+    return xb | ob == FULL
+
+
+def legal_moves(xb: int, ob: int) -> Tuple[int, ...]:
+    return MOVES[xb | ob]
+
+
+def move_count(xb: int, ob: int) -> int:
+    return POPCOUNT[xb | ob]
+
+
+def to_move(xb: int, ob: int) -> str:
+    """Side to move, with X always starting."""
+    return X if POPCOUNT[xb] == POPCOUNT[ob] else O
+
+
+def play(xb: int, ob: int, i: int, sym: str) -> Tuple[int, int]:
+    """Position after `sym` takes cell `i`; raises ValueError if the cell is taken."""
+    if (xb | ob) >> i & 1:
+        raise ValueError(f"cell {i} is already taken")
+    return (xb | 1 << i, ob) if sym == X else (xb, ob | 1 << i)
+
+
+def cell(xb: int, ob: int, i: int) -> str:
+    return X if xb >> i & 1 else (O if ob >> i & 1 else EMPTY)
+
+
+def board_string(xb: int, ob: int) -> str:
+    """9-character snapshot, row by row, '-' for empty cells."""
+    return "".join(cell(xb, ob, i) or "-" for i in range(9))
+
+
+# -------------------- N×N, K-in-a-row --------------------
+@lru_cache(maxsize=None)
+def line_windows(n: int, k: int):
+    """All K-long windows on an N×N board and, per cell, the windows through it.
+
+    Windows are (r, c) tuples in row, column, diagonal, anti-diagonal order, so
+    for 3×3 / K=3 they come out in the same order as WIN_LINES.
+    """
+    windows = []
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for r in range(n):
+            for c in range(n):
+                end_r, end_c = r + dr*(k - 1), c + dc*(k - 1)
+                if 0 <= end_r < n and 0 <= end_c < n:
+                    windows.append(tuple((r + dr*j, c + dc*j) for j in range(k)))
+    through: List[List[int]] = [[] for _ in range(n * n)]
+    for w, cells in enumerate(windows):
+        for r, c in cells:
+            through[r*n + c].append(w)
+    return tuple(windows), tuple(tuple(ws) for ws in through)
+
+
+class GameState:
+    """Incremental N×N board with K-in-a-row win detection.
+
+    Keeps a per-window stone count for each player; a move only touches the
+    windows through its cell (at most 4·K of them), so win detection costs
+    O(K) per move instead of a rescan of every line. It also keeps each
+    player's bitboard, which is what the 3×3 solver and reports are keyed on.
+    """
+
+    def __init__(self, n: int = 3, k: int = 3):
+        self.n, self.k = n, k
+        self.windows, self.through = line_windows(n, k)
+        self.cells = [EMPTY] * (n * n)
+        self.counts = {X: [0] * len(self.windows), O: [0] * len(self.windows)}
+        self.bits = {X: 0, O: 0}
+        self.history: List[int] = []
+        self.winner: Optional[str] = None
+        self.winning_line: Tuple[Tuple[int, int], ...] = ()
+
+    @property
+    def full(self) -> bool:
+        return len(self.history) == self.n * self.n
+
+    @property
+    def bitboards(self) -> Tuple[int, int]:
+        """(X bits, O bits), bit r*n + c set for an owned cell."""
+        return self.bits[X], self.bits[O]
+
+    def play(self, i: int, sym: str) -> bool:
+        """Place `sym` on cell `i`; returns True if this move completed a line."""
+        if self.cells[i] != EMPTY:
+            raise ValueError(f"cell {i} is already taken")
+        self.cells[i] = sym
+        self.bits[sym] |= 1 << i
+        self.history.append(i)
+        counts, k = self.counts[sym], self.k
+        won = False
+        for w in self.through[i]:
+            counts[w] += 1
+            if counts[w] == k and not won:
+                won = True
+                if self.winner is None:
+                    self.winner, self.winning_line = sym, self.windows[w]
+        return won
+
+
+# -------------------- Solver --------------------
+# The 8 board symmetries as cell permutations: SYMMETRIES[s][i] is where cell i goes.
+def _rot(i): r, c = divmod(i, 3); return c*3 + (2 - r)
+def _flip(i): r, c = divmod(i, 3); return r*3 + (2 - c)
+
+SYMMETRIES: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(_apply(i) for i in range(9))
+    for _apply in (
+        lambda i: i, _rot, lambda i: _rot(_rot(i)), lambda i: _rot(_rot(_rot(i))),
+        _flip, lambda i: _rot(_flip(i)), lambda i: _rot(_rot(_flip(i))), lambda i: _rot(_rot(_rot(_flip(i)))),
+    )
+)
+# _PERMUTED[s][bits] -> `bits` mapped through symmetry s
+_PERMUTED = tuple(
+    tuple(sum(1 << perm[i] for i in range(9) if b >> i & 1) for b in range(1 << 9))
+    for perm in SYMMETRIES
+)
+
+
+def canonical(xb: int, ob: int) -> int:
+    """Smallest (xb << 9 | ob) over the 8 symmetric images of the position."""
+    return min(p[xb] << 9 | p[ob] for p in _PERMUTED)
+
+
+# Negamax score of every reachable position, from the side to move's view:
+# 0 = draw, ±(1 + empty cells) = win/loss (sooner results score further from 0).
+# Keyed by canonical position, so the whole game tree is 765 entries, filled once on import.
+_VALUES = {}
+
+
+def _solve(xb: int, ob: int) -> int:
+    key = canonical(xb, ob)
+    if key in _VALUES:
+        return _VALUES[key]
+    if WIN_LINE_OF[xb] >= 0 or WIN_LINE_OF[ob] >= 0:
+        v = -(1 + 9 - POPCOUNT[xb | ob])   # the previous move won
+    elif xb | ob == FULL:
+        v = 0
+    else:
+        x_to_move = POPCOUNT[xb] == POPCOUNT[ob]
+        v = max(-_solve(xb | 1 << i, ob) if x_to_move else -_solve(xb, ob | 1 << i)
+                for i in MOVES[xb | ob])
+    _VALUES[key] = v
+    return v
+
+
+_solve(0, 0)
+
+
+def value(xb: int, ob: int) -> int:
+    """Perfect-play score for the side to move (see _VALUES)."""
+    return _VALUES[canonical(xb, ob)]
+
+
+# Chance that the computer plays a random move instead of the best one.
+LEVELS = {"random": 1.0, "easy": 0.6, "medium": 0.25, "perfect": 0.0}
+
+
+@lru_cache(maxsize=None)   # at most the 5478 reachable positions
+def best_moves(xb: int, ob: int) -> Tuple[int, ...]:
+    """All moves that keep the perfect-play score."""
+    sym = to_move(xb, ob)
+    scores = {i: -value(*play(xb, ob, i, sym)) for i in MOVES[xb | ob]}
+    top = max(scores.values())
+    return tuple(i for i, v in scores.items() if v == top)
+
+
+def computer_move(xb: int, ob: int, level: str, rng) -> int:
+    """Cell for the computer at strength `level` (a LEVELS key); `rng` is a random.Random."""
+    moves = MOVES[xb | ob]
+    if rng.random() < LEVELS[level]:
+        return rng.choice(moves)
+    return rng.choice(best_moves(xb, ob))
+
+
+# -------------------- Tournament format --------------------
+TOTAL_ROUNDS = 10
+REPORT_COLUMNS = ("round", "outcome", "moves", "winning_line", "board")
+
+
+def round_result(round_no: int, xb: int, ob: int) -> Dict:
+    """Per-round record kept by the UI and the simulator (final position of the round)."""
+    w, k = winner(xb, ob)
+    return {
+        "round": round_no,
+        "outcome": w or "Draw",
+        "moves": move_count(xb, ob),
+        "board": board_string(xb, ob),
+        "winning_line": list(WIN_LINES[k]) if w else [],
+    }
+
+
+def champion(x_wins: int, o_wins: int) -> str:
+    return X if x_wins > o_wins else (O if o_wins > x_wins else "Draw")
+
+
+def report_csv(results: Iterable[Dict]) -> str:
+    """The final-report CSV: one row per round."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(REPORT_COLUMNS)
+    for r in results:
+        wl = ";".join(f"{a}-{b}" for (a, b) in r["winning_line"])
+        writer.writerow([r["round"], r["outcome"], r["moves"], wl, r["board"]])
+    return buf.getvalue()
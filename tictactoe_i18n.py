@@ -0,0 +1,103 @@
+# tictactoe_i18n.py
+# Message catalog for the bilingual Tic-Tac-Toe UI (day12python_tictactoe.py).
+#
+# Built once per process on import: one frozen dict per language, keyed by
+# message id, with English filling any id a language leaves out. Adding a
+# language means one entry in LANGUAGES and one block in _MESSAGES; call sites
+# only ever look up ids.
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+LANGUAGES = {"en": "English", "ta": "தமிழ்"}
+DEFAULT_LANGUAGE = "ta"
+
+_MESSAGES = {
+    "en": {
+        "settings": "Settings",
+        "mode": "Mode",
+        "mode_two_players": "Two Players",
+        "mode_vs_computer": "Vs Computer",
+        "computer_strength": "Computer strength",
+        "level_random": "Random",
+        "level_easy": "Easy",
+        "level_medium": "Medium",
+        "level_perfect": "Perfect (unbeatable)",
+        "play_as": "If vs Computer, you play as",
+        "status_game_on": "Game on!",
+        "status_wins": "wins!",
+        "status_draw": "It's a draw!",
+        "status_to_move": "to move",
+        "round": "Round",
+        "draws": "Draws",
+        "reset_game": "Reset Game (current round)",
+        "reset_tournament": "Reset Tournament (all 10 rounds)",
+        "status": "Status",
+        "final_board": "### Final Board (This Round)",
+        "next_round": "Next Round ▶️",
+        "tournament_finished": "Tournament Finished — Final Report",
+        "draw_tie": "Draw (Tie)",
+        "champion": "Champion",
+        "round_results": "Round-wise Results",
+        "col_round": "Round",
+        "col_outcome": "Outcome",
+        "col_moves": "Moves",
+        "col_winning_line": "Winning Line",
+        "col_board": "Board (r1-3,c1-3)",
+        "download_report": "Download Final Report (CSV)",
+        "tip": "Tip: Switch தமிழ் / English from the sidebar. Reset just this round or the whole tournament anytime.",
+    },
+    "ta": {
+        "settings": "அமைப்புகள்",
+        "mode": "விளையாட்டு முறை",
+        "mode_two_players": "இருவர்",
+        "mode_vs_computer": "கணினி எதிர்",
+        "computer_strength": "கணினி திறன்",
+        "level_random": "சீரற்ற",
+        "level_easy": "எளிது",
+        "level_medium": "நடுத்தரம்",
+        "level_perfect": "முழுமை (வெல்ல முடியாது)",
+        "play_as": "கணினி எதிரில் நீங்கள் ஆடும் அடையாளம்",
+        "status_game_on": "விளையாட்டு தொடங்கியது!",
+        "status_wins": "வெற்றி!",
+        "status_draw": "டிரா!",
+        "status_to_move": "ஆட வேண்டியது",
+        "round": "சுற்று",
+        "draws": "டிரா",
+        "reset_game": "இந்த சுற்று ரீசெட்",
+        "reset_tournament": "முழு 10 சுற்று ரீசெட்",
+        "status": "நிலை",
+        "final_board": "### இந்த சுற்றின் இறுதி பலகை",
+        "next_round": "அடுத்த சுற்று ▶️",
+        "tournament_finished": "டூர்ணமெண்ட் முடிந்தது — இறுதி அறிக்கை",
+        "draw_tie": "டிரா (சமநிலை)",
+        "champion": "சாம்பியன்",
+        "round_results": "சுற்று வாரியான முடிவுகள்",
+        "col_round": "சுற்று",
+        "col_outcome": "முடிவு",
+        "col_moves": "நடவடிக்கை",
+        "col_winning_line": "வெற்றி வரி",
+        "col_board": "பலகை",
+        "download_report": "இறுதி அறிக்கை பதிவிறக்கு (CSV)",
+        "tip": "குறிப்பு: பக்கப்பட்டியில் தமிழ் / English மாற்றலாம். இந்த சுற்றை மட்டும் அல்லது முழு 10 சுற்றையும் ரீசெட் செய்யலாம்.",
+    },
+}
+
+CATALOG: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    lang: MappingProxyType({**_MESSAGES["en"], **_MESSAGES.get(lang, {})})
+    for lang in LANGUAGES
+})
+
+REPORT_COLUMN_IDS = ("col_round", "col_outcome", "col_moves", "col_winning_line", "col_board")
+
+
+def catalog(lang: str) -> Mapping[str, str]:
+    """Frozen message-id → text mapping for `lang` (English if unknown)."""
+    return CATALOG.get(lang, CATALOG["en"])
+
+
+@lru_cache(maxsize=None)
+def report_header(lang: str) -> Tuple[str, ...]:
+    """Translated column titles of the round-wise report table."""
+    m = catalog(lang)
+    return tuple(m[i] for i in REPORT_COLUMN_IDS)
@@ -0,0 +1,157 @@
+# tictactoe_tournament_sim.py
+# Headless simulator for the 10-round Tic-Tac-Toe tournament in day12python_tictactoe.py.
+# Plays many tournaments between pluggable strategies on a process pool and
+# reports the same aggregate + CSV shape as the app's final report.
+# Run: python tictactoe_tournament_sim.py --tournaments 1000000 --x minimax --o greedy
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import tictactoe_engine as engine
+from tictactoe_engine import MOVES, WIN_LINE_OF, X, O
+
+# A strategy picks a cell for the side to move: (my bits, their bits, rng) -> cell.
+Strategy = Callable[[int, int, random.Random], int]
+
+
+def random_strategy(mine: int, theirs: int, rng: random.Random) -> int:
+    return rng.choice(MOVES[mine | theirs])
+
+
+def greedy_strategy(mine: int, theirs: int, rng: random.Random) -> int:
+    """Win if possible, else block, else centre, corner, edge."""
+    moves = MOVES[mine | theirs]
+    for i in moves:
+        if WIN_LINE_OF[mine | 1 << i] >= 0:
+            return i
+    for i in moves:
+        if WIN_LINE_OF[theirs | 1 << i] >= 0:
+            return i
+    for pref in ((4,), (0, 2, 6, 8), (1, 3, 5, 7)):
+        options = [i for i in pref if i in moves]
+        if options:
+            return rng.choice(options)
+    raise ValueError("no legal moves")
+
+
+def minimax_strategy(mine: int, theirs: int, rng: random.Random) -> int:
+    # best_moves() wants (X bits, O bits); X is to move when the counts match
+    if engine.POPCOUNT[mine] == engine.POPCOUNT[theirs]:
+        return rng.choice(engine.best_moves(mine, theirs))
+    return rng.choice(engine.best_moves(theirs, mine))
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "random": random_strategy,
+    "greedy": greedy_strategy,
+    "minimax": minimax_strategy,
+}
+
+
+def play_round(x_strat: Strategy, o_strat: Strategy, rng: random.Random) -> Tuple[int, int]:
+    """One game, X first; returns the final (xb, ob)."""
+    xb = ob = 0
+    while True:
+        xb |= 1 << x_strat(xb, ob, rng)
+        if WIN_LINE_OF[xb] >= 0 or xb | ob == engine.FULL:
+            return xb, ob
+        ob |= 1 << o_strat(ob, xb, rng)
+        if WIN_LINE_OF[ob] >= 0:
+            return xb, ob
+
+
+def play_tournament(x_strat: Strategy, o_strat: Strategy, rng: random.Random,
+                    rounds: int = engine.TOTAL_ROUNDS, keep_rounds: bool = False):
+    """(x_wins, o_wins, draws, per-round results or None) for one tournament."""
+    x_wins = o_wins = 0
+    results: Optional[List[Dict]] = [] if keep_rounds else None
+    for rnd in range(1, rounds + 1):
+        xb, ob = play_round(x_strat, o_strat, rng)
+        if WIN_LINE_OF[xb] >= 0:
+            x_wins += 1
+        elif WIN_LINE_OF[ob] >= 0:
+            o_wins += 1
+        if keep_rounds:
+            results.append(engine.round_result(rnd, xb, ob))
+    return x_wins, o_wins, rounds - x_wins - o_wins, results
+
+
+def _run_chunk(args) -> Tuple[int, int, int, int, int, int]:
+    """Worker: totals for `n` tournaments -> (x_wins, o_wins, draws, champ X, champ O, champ Draw)."""
+    n, x_name, o_name, seed, rounds = args
+    rng = random.Random(seed)
+    xs, os_ = STRATEGIES[x_name], STRATEGIES[o_name]
+    tx = to = td = cx = co = cd = 0
+    for _ in range(n):
+        x, o, d, _ = play_tournament(xs, os_, rng, rounds)
+        tx += x; to += o; td += d
+        if x > o: cx += 1
+        elif o > x: co += 1
+        else: cd += 1
+    return tx, to, td, cx, co, cd
+
+
+def simulate(tournaments: int, x: str = "minimax", o: str = "random",
+             workers: Optional[int] = None, seed: int = 0,
+             rounds: int = engine.TOTAL_ROUNDS) -> Dict:
+    """Play `tournaments` tournaments across a process pool.
+
+    Returns the on-screen aggregate (wins, draws and integer percentages like the
+    final report), the champion distribution, and one sample tournament's
+    per-round results for report_csv().
+    """
+    workers = workers or os.cpu_count() or 1
+    n_chunks = min(tournaments, workers * 8) or 1
+    sizes = [tournaments // n_chunks + (i < tournaments % n_chunks) for i in range(n_chunks)]
+    jobs = [(size, x, o, seed * 1_000_003 + i, rounds) for i, size in enumerate(sizes)]
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        parts = list(map(_run_chunk, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_run_chunk, jobs))
+    elapsed = time.perf_counter() - t0
+
+    xw, ow, dr, cx, co, cd = (sum(col) for col in zip(*parts))
+    total = xw + ow + dr or 1
+    *_, sample = play_tournament(STRATEGIES[x], STRATEGIES[o], random.Random(seed), rounds, keep_rounds=True)
+    return {
+        "tournaments": tournaments, "rounds": xw + ow + dr, "x": x, "o": o,
+        "x_wins": xw, "o_wins": ow, "draws": dr,
+        "x_pct": xw * 100 // total, "o_pct": ow * 100 // total, "draw_pct": dr * 100 // total,
+        "champion": {X: cx, O: co, "Draw": cd},
+        "sample_results": sample,
+        "seconds": elapsed, "workers": workers,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Simulate 10-round Tic-Tac-Toe tournaments.")
+    ap.add_argument("--tournaments", type=int, default=100_000)
+    ap.add_argument("--x", choices=STRATEGIES, default="minimax", help="strategy for X (moves first)")
+    ap.add_argument("--o", choices=STRATEGIES, default="random", help="strategy for O")
+    ap.add_argument("--workers", type=int, default=0, help="processes (default: all cores)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--csv", help="write a sample tournament's round-wise report here")
+    args = ap.parse_args()
+
+    r = simulate(args.tournaments, args.x, args.o, args.workers or None, args.seed)
+    print(f"{r['tournaments']:,} tournaments ({r['rounds']:,} rounds) of X={r['x']} vs O={r['o']} "
+          f"on {r['workers']} workers in {r['seconds']:.2f}s "
+          f"→ {r['tournaments'] / r['seconds']:,.0f} tournaments/s")
+    print(f"❌ X Wins: {r['x_wins']:,} ({r['x_pct']}%)  ⭕ O Wins: {r['o_wins']:,} ({r['o_pct']}%)  "
+          f"🤝 Draws: {r['draws']:,} ({r['draw_pct']}%)")
+    ch = r["champion"]
+    print(f"🏆 Champion: X {ch[X]:,}  O {ch[O]:,}  Draw {ch['Draw']:,}")
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            f.write(engine.report_csv(r["sample_results"]))
+        print(f"sample report written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# water_store.py
+# Day-bucketed intake log for day6python_waterintaketracker.py.
+#
+# Each day's millilitres live in one int32 slot of a fixed ring, picked by the
+# day's ordinal modulo the ring size. Moving to a new day zeroes only the slots
+# that fell out of the retention window, so adding water, today's total and the
+# 7-day window are all constant-time. A DataFrame is built only for export.
+#
+# HydrationStore keeps named users' logs in SQLite (WAL mode) so they survive
+# the tab and are shared across devices. Every entry is appended to `intake`
+# and the user's per-day total is bumped in `daily_intake` in the same
+# transaction; today, the 7-day window and goal stats read a handful of rollup
+# rows through the (user, day) primary key, never the entries.
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+RETENTION_DAYS = 60   # days kept before today
+CAPACITY = 64         # ring slots; must exceed RETENTION_DAYS
+
+DEFAULT_PATH = os.environ.get("WATER_INTAKE_DB", "water_intake.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS intake (
+    user  TEXT NOT NULL,
+    ts    TEXT NOT NULL,      -- ISO timestamp of the entry
+    day   TEXT NOT NULL,      -- YYYY-MM-DD the water counts towards
+    ml    INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS intake_user_day ON intake(user, day);
+
+CREATE TABLE IF NOT EXISTS daily_intake (
+    user  TEXT NOT NULL,
+    day   TEXT NOT NULL,
+    ml    INTEGER NOT NULL,
+    PRIMARY KEY (user, day)
+) WITHOUT ROWID;
+"""
+
+_DAILY = """
+INSERT INTO daily_intake (user, day, ml) VALUES (?, ?, ?)
+ON CONFLICT(user, day) DO UPDATE SET ml = ml + excluded.ml
+"""
+
+
+class IntakeRing:
+    def __init__(self, retention_days: int = RETENTION_DAYS, capacity: int = CAPACITY):
+        if capacity <= retention_days:
+            raise ValueError("capacity must be larger than retention_days")
+        self.retention_days = retention_days
+        self.ml = np.zeros(capacity, dtype=np.int32)
+        self.newest: Optional[int] = None   # ordinal of the latest day the ring covers
+
+    def _advance(self, today: Optional[date]) -> int:
+        """Roll the ring forward to `today`, zeroing the slots of days that expired; returns its ordinal."""
+        t = (today or date.today()).toordinal()
+        if self.newest is None or t - self.newest >= len(self.ml):
+            self.ml[:] = 0
+        elif t > self.newest:
+            self.ml[np.arange(self.newest + 1, t + 1) % len(self.ml)] = 0
+        if self.newest is None or t > self.newest:
+            self.newest = t
+        return t
+
+    def _slot(self, d: date, t: int) -> Optional[int]:
+        o = d.toordinal()
+        return o % len(self.ml) if 0 <= t - o <= self.retention_days else None
+
+    def add(self, d: date, ml: int, today: Optional[date] = None) -> bool:
+        """Add `ml` to day `d`; False if `d` is in the future or past retention."""
+        slot = self._slot(d, self._advance(today))
+        if slot is None:
+            return False
+        self.ml[slot] += int(ml)
+        return True
+
+    def day_total(self, d: date, today: Optional[date] = None) -> int:
+        slot = self._slot(d, self._advance(today))
+        return 0 if slot is None else int(self.ml[slot])
+
+    def today_total(self, today: Optional[date] = None) -> int:
+        today = today or date.today()
+        return self.day_total(today, today)
+
+    def window(self, days: int = 7, today: Optional[date] = None) -> np.ndarray:
+        """Daily ml for the last `days` days ending today, oldest first."""
+        if not 0 < days <= self.retention_days + 1:
+            raise ValueError(f"days must be between 1 and {self.retention_days + 1}")
+        t = self._advance(today)
+        return self.ml[np.arange(t - days + 1, t + 1) % len(self.ml)].copy()
+
+    def clear_day(self, d: date, today: Optional[date] = None):
+        slot = self._slot(d, self._advance(today))
+        if slot is not None:
+            self.ml[slot] = 0
+
+    def clear(self):
+        self.ml[:] = 0
+        self.newest = None
+
+    def empty(self, today: Optional[date] = None) -> bool:
+        self._advance(today)
+        return not self.ml.any()
+
+    def to_frame(self, today: Optional[date] = None) -> "pd.DataFrame":
+        """Days with intake as a (date, ml) DataFrame, oldest first."""
+        import pandas as pd   # only needed for viewing / export
+
+        today = today or date.today()
+        ml = self.window(self.retention_days + 1, today)
+        start = today - timedelta(days=self.retention_days)
+        days = np.flatnonzero(ml)
+        return pd.DataFrame({
+            "date": pd.to_datetime([start + timedelta(days=int(i)) for i in days]),
+            "ml": ml[days].astype(int),
+        }, columns=["date", "ml"])
+
+
+def user_key(name: str) -> str:
+    """Names are matched ignoring case and surrounding spaces."""
+    return name.strip().casefold()
+
+
+class HydrationStore:
+    """One SQLite connection shared by the app's sessions; every call holds a lock."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def _query(self, sql: str, args: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self.conn.execute(sql, args).fetchall()
+
+    def user(self, name: str) -> "UserLog":
+        return UserLog(self, user_key(name))
+
+    # -------------------- Writes --------------------
+    def add(self, user: str, d: date, ml: int, when: Optional[datetime] = None):
+        """Append one entry and bump the user's total for day `d`, atomically."""
+        ts = (when or datetime.now()).isoformat(timespec="seconds")
+        with self._lock, self.conn:
+            self.conn.execute("INSERT INTO intake VALUES (?, ?, ?, ?)", (user, ts, d.isoformat(), int(ml)))
+            self.conn.execute(_DAILY, (user, d.isoformat(), int(ml)))
+
+    def clear_day(self, user: str, d: date):
+        with self._lock, self.conn:
+            for table in ("intake", "daily_intake"):
+                self.conn.execute(f"DELETE FROM {table} WHERE user = ? AND day = ?", (user, d.isoformat()))
+
+    def clear(self, user: str):
+        with self._lock, self.conn:
+            for table in ("intake", "daily_intake"):
+                self.conn.execute(f"DELETE FROM {table} WHERE user = ?", (user,))
+
+    # -------------------- Reads --------------------
+    def day_total(self, user: str, d: date) -> int:
+        rows = self._query("SELECT ml FROM daily_intake WHERE user = ? AND day = ?", (user, d.isoformat()))
+        return rows[0][0] if rows else 0
+
+    def daily_totals(self, user: str, start: date, end: date) -> Dict[str, int]:
+        """{YYYY-MM-DD: ml} for days start..end inclusive that have intake."""
+        return dict(self._query(
+            "SELECT day, ml FROM daily_intake WHERE user = ? AND day BETWEEN ? AND ?",
+            (user, start.isoformat(), end.isoformat())))
+
+    def has_entries(self, user: str, start: date, end: date) -> bool:
+        return bool(self._query(
+            "SELECT 1 FROM daily_intake WHERE user = ? AND day BETWEEN ? AND ? AND ml != 0 LIMIT 1",
+            (user, start.isoformat(), end.isoformat())))
+
+
+class UserLog:
+    """One user's log in a HydrationStore, with the same calls as IntakeRing."""
+
+    def __init__(self, store: HydrationStore, user: str, retention_days: int = RETENTION_DAYS):
+        self.store, self.user, self.retention_days = store, user, retention_days
+
+    def add(self, d: date, ml: int, today: Optional[date] = None) -> bool:
+        if d > (today or date.today()):
+            return False
+        self.store.add(self.user, d, ml)
+        return True
+
+    def day_total(self, d: date, today: Optional[date] = None) -> int:
+        return self.store.day_total(self.user, d)
+
+    def today_total(self, today: Optional[date] = None) -> int:
+        return self.store.day_total(self.user, today or date.today())
+
+    def window(self, days: int = 7, today: Optional[date] = None) -> np.ndarray:
+        """Daily ml for the last `days` days ending today, oldest first."""
+        today = today or date.today()
+        start = today - timedelta(days=days - 1)
+        totals = self.store.daily_totals(self.user, start, today)
+        return np.array([totals.get((start + timedelta(days=i)).isoformat(), 0) for i in range(days)],
+                        dtype=np.int32)
+
+    def clear_day(self, d: date, today: Optional[date] = None):
+        self.store.clear_day(self.user, d)
+
+    def clear(self):
+        self.store.clear(self.user)
+
+    def empty(self, today: Optional[date] = None) -> bool:
+        today = today or date.today()
+        return not self.store.has_entries(self.user, today - timedelta(days=self.retention_days), today)
+
+    def to_frame(self, today: Optional[date] = None) -> "pd.DataFrame":
+        """The last retention_days of daily totals as a (date, ml) DataFrame, oldest first."""
+        import pandas as pd   # only needed for viewing / export
+
+        today = today or date.today()
+        totals = self.store.daily_totals(self.user, today - timedelta(days=self.retention_days), today)
+        days = sorted(d for d, ml in totals.items() if ml)
+        return pd.DataFrame({
+            "date": pd.to_datetime(days),
+            "ml": [int(totals[d]) for d in days],
+        }, columns=["date", "ml"])